@@ -7,7 +7,9 @@ from homeassistant.const import Platform
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers import device_registry as dr
 
-from .coordinator import BboxDataUpdateCoordinator
+from .const import DOMAIN
+from .coordinator import BboxDataUpdateCoordinator, snapshot_store
+from .session import async_remove_client_slot
 
 type BBoxConfigEntry = ConfigEntry[BboxDataUpdateCoordinator]
 
@@ -21,14 +23,23 @@ PLATFORMS: list[Platform] = [
 
 
 async def async_setup_entry(hass: HomeAssistant, entry: BBoxConfigEntry) -> bool:
-    """Set up Bouygues Bbox from a config entry."""
+    """Set up Bouygues Bbox from a config entry.
+
+    Entities are created from the last snapshot if any, the Bbox is then
+    refreshed in the background.
+    """
     coordinator = BboxDataUpdateCoordinator(hass, entry)
-    await coordinator.async_config_entry_first_refresh()
+    if not (restored := await coordinator.async_restore_snapshot()):
+        await coordinator.async_config_entry_first_refresh()
     entry.runtime_data = coordinator
 
     entry.async_on_unload(entry.add_update_listener(coordinator.update_configuration))
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
 
+    if restored:
+        entry.async_create_background_task(
+            hass, coordinator.async_refresh(), f"{DOMAIN} first refresh"
+        )
     return True
 
 
@@ -37,6 +48,12 @@ async def async_unload_entry(hass: HomeAssistant, entry: BBoxConfigEntry) -> boo
     return await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
 
 
+async def async_remove_entry(hass: HomeAssistant, entry: BBoxConfigEntry) -> None:
+    """Remove the snapshot and the client of a removed entry."""
+    async_remove_client_slot(hass, entry.entry_id)
+    await snapshot_store(hass, entry.entry_id).async_remove()
+
+
 async def async_remove_config_entry_device(
     hass: HomeAssistant, entry: BBoxConfigEntry, device_entry: dr.DeviceEntry
 ) -> bool:
@@ -16,7 +16,6 @@ from homeassistant.helpers.typing import StateType
 
 from . import BBoxConfigEntry
 from .entity import BboxEntity
-from .helpers import finditem
 
 
 @dataclass(frozen=True)
@@ -83,7 +82,7 @@ class BboxBinarySensor(BboxEntity, BinarySensorEntity):
     @property
     def is_on(self):
         """Return sensor state."""
-        data = finditem(self.coordinator.data, self.entity_description.key)
+        data = self._key_getter(self.coordinator.data)
         if self.entity_description.value_fn is not None:
             return self.entity_description.value_fn(data)
         return data
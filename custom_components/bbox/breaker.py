@@ -0,0 +1,66 @@
+"""Circuit breaker of the Bbox API endpoints."""
+
+from __future__ import annotations
+
+from time import monotonic
+from typing import Any
+
+# Consecutive failures opening the circuit
+BREAKER_THRESHOLD = 3
+# First and longest time (in seconds) an open circuit is skipped
+BREAKER_BACKOFF = 60
+BREAKER_MAX_BACKOFF = 3600
+
+
+class CircuitBreaker:
+    """Skip an endpoint failing repeatedly, probe it again with a backoff."""
+
+    def __init__(
+        self,
+        threshold: int = BREAKER_THRESHOLD,
+        backoff: float = BREAKER_BACKOFF,
+        max_backoff: float = BREAKER_MAX_BACKOFF,
+    ) -> None:
+        """Initialize."""
+        self.threshold = threshold
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.failures = 0
+        self.retry_at = 0.0
+
+    @property
+    def state(self) -> str:
+        """Return closed, open or half_open when the next request is a probe."""
+        if self.failures < self.threshold:
+            return "closed"
+        if monotonic() < self.retry_at:
+            return "open"
+        return "half_open"
+
+    def allow(self) -> bool:
+        """Return True if the endpoint may be requested."""
+        return self.state != "open"
+
+    def record_success(self) -> None:
+        """Close the circuit."""
+        self.failures = 0
+        self.retry_at = 0.0
+
+    def record_failure(self) -> float | None:
+        """Count a failure, return the backoff if the circuit is open."""
+        self.failures += 1
+        if self.failures < self.threshold:
+            return None
+        delay = min(
+            self.backoff * 2 ** (self.failures - self.threshold), self.max_backoff
+        )
+        self.retry_at = monotonic() + delay
+        return delay
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the state of the circuit."""
+        return {
+            "state": self.state,
+            "failures": self.failures,
+            "retry_in": max(round(self.retry_at - monotonic()), 0),
+        }
@@ -42,7 +42,7 @@ class RestartButton(BboxEntity, ButtonEntity):
     async def async_press(self) -> None:
         """Handle the button press."""
         try:
-            await self.coordinator.bbox.device.async_reboot()
+            await self.coordinator.async_write("device", "async_reboot", refresh=True)
         except BboxException as error:
             _LOGGER.error(error)
 
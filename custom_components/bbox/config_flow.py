@@ -12,18 +12,44 @@ from homeassistant import config_entries
 from homeassistant.const import CONF_HOST, CONF_PASSWORD, CONF_VERIFY_SSL
 from homeassistant.core import callback
 from homeassistant.data_entry_flow import FlowResult
-from homeassistant.helpers.aiohttp_client import async_create_clientsession
 
 from .const import (
+    CONF_ADAPTIVE_REFRESH,
+    CONF_FAST_REFRESH_RATE,
+    CONF_FULL_WRITE_INTERVAL,
+    CONF_MAX_REFRESH_RATE,
+    CONF_MAX_REQUESTS,
+    CONF_MAX_STALENESS,
+    CONF_MERGE_CONFLICT,
+    CONF_MIN_REFRESH_RATE,
+    CONF_RECORD_TRAFFIC,
     CONF_REFRESH_RATE,
+    CONF_REQUEST_TIMEOUT,
+    CONF_SLOW_REFRESH_RATE,
     CONF_USE_TLS,
+    CONFLICT_COLLECT,
+    CONFLICT_LAST_WINS,
+    CONFLICT_RAISE,
+    DEFAULT_ADAPTIVE_REFRESH,
+    DEFAULT_FAST_REFRESH_RATE,
+    DEFAULT_FULL_WRITE_INTERVAL,
     DEFAULT_HOST,
+    DEFAULT_MAX_REFRESH_RATE,
+    DEFAULT_MAX_REQUESTS,
+    DEFAULT_MAX_STALENESS,
+    DEFAULT_MERGE_CONFLICT,
+    DEFAULT_MIN_REFRESH_RATE,
+    DEFAULT_RECORD_TRAFFIC,
     DEFAULT_REFRESH_RATE,
+    DEFAULT_REQUEST_TIMEOUT,
+    DEFAULT_SLOW_REFRESH_RATE,
     DEFAULT_TITLE,
     DEFAULT_USE_TLS,
     DEFAULT_VERIFY_SSL,
     DOMAIN,
+    MAX_REQUESTS_LIMIT,
 )
+from .session import async_create_session
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -60,6 +86,9 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 api = Bbox(
                     hostname=user_input[CONF_HOST],
                     password=user_input[CONF_PASSWORD],
+                    session=async_create_session(
+                        self.hass, user_input[CONF_VERIFY_SSL]
+                    ),
                     use_tls=user_input[CONF_USE_TLS],
                     verify_ssl=user_input[CONF_VERIFY_SSL],
                 )
@@ -105,7 +134,9 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 api = Bbox(
                     hostname=self.entry_data[CONF_HOST],
                     password=user_input[CONF_PASSWORD],
-                    session=async_create_clientsession(self.hass),
+                    session=async_create_session(
+                        self.hass, self.entry_data[CONF_VERIFY_SSL]
+                    ),
                     use_tls=self.entry_data[CONF_USE_TLS],
                     verify_ssl=self.entry_data[CONF_VERIFY_SSL],
                 )
@@ -139,15 +170,62 @@ class OptionsFlow(config_entries.OptionsFlow):
         self, user_input: Mapping[str, Any] | None = None
     ) -> FlowResult:
         """Manage the options."""
+        errors: dict[str, str] = {}
         if user_input:
-            return self.async_create_entry(data=user_input)
+            if user_input.get(
+                CONF_MIN_REFRESH_RATE, DEFAULT_MIN_REFRESH_RATE
+            ) > user_input.get(CONF_MAX_REFRESH_RATE, DEFAULT_MAX_REFRESH_RATE):
+                errors["base"] = "invalid_refresh_bounds"
+            else:
+                return self.async_create_entry(data=user_input)
 
         return self.async_show_form(
             step_id="init",
             data_schema=self.add_suggested_values_to_schema(
                 vol.Schema(
-                    {vol.Optional(CONF_REFRESH_RATE, default=DEFAULT_REFRESH_RATE): int}
+                    {
+                        vol.Optional(
+                            CONF_FAST_REFRESH_RATE, default=DEFAULT_FAST_REFRESH_RATE
+                        ): vol.All(int, vol.Range(min=1)),
+                        vol.Optional(
+                            CONF_REFRESH_RATE, default=DEFAULT_REFRESH_RATE
+                        ): vol.All(int, vol.Range(min=1)),
+                        vol.Optional(
+                            CONF_SLOW_REFRESH_RATE, default=DEFAULT_SLOW_REFRESH_RATE
+                        ): vol.All(int, vol.Range(min=1)),
+                        vol.Optional(
+                            CONF_MAX_REQUESTS, default=DEFAULT_MAX_REQUESTS
+                        ): vol.All(int, vol.Range(min=1, max=MAX_REQUESTS_LIMIT)),
+                        vol.Optional(
+                            CONF_REQUEST_TIMEOUT, default=DEFAULT_REQUEST_TIMEOUT
+                        ): vol.All(int, vol.Range(min=1)),
+                        vol.Optional(
+                            CONF_FULL_WRITE_INTERVAL,
+                            default=DEFAULT_FULL_WRITE_INTERVAL,
+                        ): vol.All(int, vol.Range(min=0)),
+                        vol.Optional(
+                            CONF_MAX_STALENESS, default=DEFAULT_MAX_STALENESS
+                        ): vol.All(int, vol.Range(min=0)),
+                        vol.Optional(
+                            CONF_ADAPTIVE_REFRESH, default=DEFAULT_ADAPTIVE_REFRESH
+                        ): bool,
+                        vol.Optional(
+                            CONF_MIN_REFRESH_RATE, default=DEFAULT_MIN_REFRESH_RATE
+                        ): vol.All(int, vol.Range(min=1)),
+                        vol.Optional(
+                            CONF_MAX_REFRESH_RATE, default=DEFAULT_MAX_REFRESH_RATE
+                        ): vol.All(int, vol.Range(min=1)),
+                        vol.Optional(
+                            CONF_MERGE_CONFLICT, default=DEFAULT_MERGE_CONFLICT
+                        ): vol.In(
+                            [CONFLICT_COLLECT, CONFLICT_LAST_WINS, CONFLICT_RAISE]
+                        ),
+                        vol.Optional(
+                            CONF_RECORD_TRAFFIC, default=DEFAULT_RECORD_TRAFFIC
+                        ): bool,
+                    }
                 ),
-                self.config_entry.options,
+                user_input or self.config_entry.options,
             ),
+            errors=errors,
         )
@@ -6,10 +6,38 @@ MANUFACTURER = "Bouygues"
 DEFAULT_TITLE = f"{MANUFACTURER} {BBOX_NAME}"
 CONF_USE_TLS = "use_tls"
 CONF_REFRESH_RATE = "refresh_rate"
+CONF_FAST_REFRESH_RATE = "fast_refresh_rate"
+CONF_SLOW_REFRESH_RATE = "slow_refresh_rate"
+CONF_MAX_REQUESTS = "max_requests"
+CONF_FULL_WRITE_INTERVAL = "full_write_interval"
+CONF_ADAPTIVE_REFRESH = "adaptive_refresh"
+CONF_MIN_REFRESH_RATE = "min_refresh_rate"
+CONF_MAX_REFRESH_RATE = "max_refresh_rate"
+CONF_MAX_STALENESS = "max_staleness"
+CONF_REQUEST_TIMEOUT = "request_timeout"
+CONF_RECORD_TRAFFIC = "record_traffic"
+CONF_MERGE_CONFLICT = "merge_conflict"
 DEFAULT_HOST = "mabbox.bytel.fr"
 DEFAULT_USE_TLS = True
 DEFAULT_VERIFY_SSL = True
 DEFAULT_REFRESH_RATE = 60
+DEFAULT_FAST_REFRESH_RATE = 10
+DEFAULT_SLOW_REFRESH_RATE = 300
+DEFAULT_MAX_REQUESTS = 4
+MAX_REQUESTS_LIMIT = 10
+DEFAULT_FULL_WRITE_INTERVAL = 3600
+DEFAULT_ADAPTIVE_REFRESH = False
+DEFAULT_MIN_REFRESH_RATE = 10
+DEFAULT_MAX_REFRESH_RATE = 300
+DEFAULT_MAX_STALENESS = 900
+DEFAULT_REQUEST_TIMEOUT = 20
+DEFAULT_RECORD_TRAFFIC = False
+
+# Policies of merge_objects when objects have different values for a key
+CONFLICT_RAISE = "raise"
+CONFLICT_LAST_WINS = "last_wins"
+CONFLICT_COLLECT = "collect"
+DEFAULT_MERGE_CONFLICT = CONFLICT_COLLECT
 
 TO_REDACT = {
     "account",
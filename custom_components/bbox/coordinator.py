@@ -2,22 +2,157 @@
 
 from __future__ import annotations
 
+import asyncio
 import logging
-from collections.abc import Callable
-from datetime import timedelta
-from typing import Any
+from collections import deque
+from collections.abc import AsyncIterator, Awaitable, Callable, Mapping
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from functools import partial
+from pathlib import Path
+from time import monotonic
+from typing import Any, Final
 
-from bboxpy import AuthorizationError, Bbox, BboxException
+from bboxpy import AuthorizationError, Bbox, BboxException, TimeoutExceededError
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import CONF_HOST, CONF_PASSWORD, CONF_VERIFY_SSL
-from homeassistant.core import HomeAssistant
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
 from homeassistant.exceptions import ConfigEntryAuthFailed
+from homeassistant.helpers.storage import Store
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+from homeassistant.util import dt as dt_util
 
-from .const import CONF_REFRESH_RATE, CONF_USE_TLS, DEFAULT_REFRESH_RATE, DOMAIN
+from .breaker import CircuitBreaker
+from .const import (
+    CONF_ADAPTIVE_REFRESH,
+    CONF_FAST_REFRESH_RATE,
+    CONF_FULL_WRITE_INTERVAL,
+    CONF_MAX_REFRESH_RATE,
+    CONF_MAX_REQUESTS,
+    CONF_MAX_STALENESS,
+    CONF_MERGE_CONFLICT,
+    CONF_MIN_REFRESH_RATE,
+    CONF_RECORD_TRAFFIC,
+    CONF_REFRESH_RATE,
+    CONF_REQUEST_TIMEOUT,
+    CONF_SLOW_REFRESH_RATE,
+    CONF_USE_TLS,
+    CONFLICT_COLLECT,
+    CONFLICT_LAST_WINS,
+    CONFLICT_RAISE,
+    DEFAULT_ADAPTIVE_REFRESH,
+    DEFAULT_FAST_REFRESH_RATE,
+    DEFAULT_FULL_WRITE_INTERVAL,
+    DEFAULT_MAX_REFRESH_RATE,
+    DEFAULT_MAX_REQUESTS,
+    DEFAULT_MAX_STALENESS,
+    DEFAULT_MERGE_CONFLICT,
+    DEFAULT_MIN_REFRESH_RATE,
+    DEFAULT_RECORD_TRAFFIC,
+    DEFAULT_REFRESH_RATE,
+    DEFAULT_REQUEST_TIMEOUT,
+    DEFAULT_SLOW_REFRESH_RATE,
+    DOMAIN,
+)
+from .derived import compute_derived
+from .helpers import compile_key_chain
+from .hosts import Host
+from .metrics import EndpointMetrics
+from .recorder import TrafficRecorder
+from .scheduler import async_get_scheduler
+from .session import (
+    async_get_client_slot,
+    async_get_connection_stats,
+    async_get_session,
+)
+from .throughput import ThroughputBuffer, samples_for
 
 _LOGGER = logging.getLogger(__name__)
 
+# Section of coordinator.data => (api, method) of the Bbox client
+ENDPOINTS: Final[dict[str, tuple[str, str]]] = {
+    "info": ("device", "async_get_bbox_info"),
+    "memory": ("device", "async_get_bbox_mem"),
+    "led": ("device", "async_get_bbox_led"),
+    "devices": ("lan", "async_get_connected_devices"),
+    "wan_ip_stats": ("wan", "async_get_wan_ip_stats"),
+    "parentalcontrol": ("parentalcontrol", "async_get_parental_control_service_state"),
+    "wps": ("wifi", "async_get_wps"),
+    "wifi": ("wifi", "async_get_wireless"),
+    "wan_ip": ("wan", "async_get_wan_ip"),
+    "speedtest_infos": ("speedtest", "async_get_speedtest_infos"),
+}
+
+# Sections refreshed together, each tier has its own refresh rate
+TIERS: Final[dict[str, tuple[str, ...]]] = {
+    "fast": ("wan_ip_stats",),
+    "medium": ("devices", "wifi", "wps", "parentalcontrol"),
+    "slow": ("info", "memory", "led", "speedtest_infos", "wan_ip"),
+}
+
+# The refresh interval is only honored to the second
+TIER_TOLERANCE = 1
+
+# Backoff (first delay and deadline, in seconds) to confirm a state change
+CONFIRM_DELAY = 0.5
+CONFIRM_TIMEOUT = 10
+
+# Quiet time (in seconds) after the last write before confirming a burst
+WRITE_SETTLE_DELAY = 0.5
+
+# Snapshot of data saved to start without waiting for the Bbox
+SNAPSHOT_VERSION = 1
+SNAPSHOT_SAVE_DELAY = 60
+
+_MISSING: Final = object()
+
+# Sections kept (in seconds) between requests, they change rarely: the WAN
+# address until the WAN reconnects, the speed test until the Bbox runs the
+# next one. info is not cached, its model, serial number and firmware come
+# with its uptime, temperature and number of boots which keep changing.
+CACHE_TTL: Final[dict[str, int]] = {
+    "wan_ip": 3600,
+    "speedtest_infos": 1800,
+}
+
+# Adaptive refresh: factors applied to the interval of the fast and medium
+# tiers when data changes, is stable or the Bbox is loaded
+ADAPTIVE_SPEEDUP = 0.5
+ADAPTIVE_BACKOFF = 1.5
+ADAPTIVE_LOAD_BACKOFF = 2
+# Relative change of a bandwidth considered as a change
+ADAPTIVE_BANDWIDTH_CHANGE = 0.2
+# Load thresholds: refresh duration (in milliseconds) and free memory (in %)
+ADAPTIVE_SLOW_REFRESH = 2000
+ADAPTIVE_LOW_MEMORY = 10
+
+BANDWIDTHS: Final = tuple(
+    compile_key_chain(f"wan_ip_stats.wan.ip.stats.{direction}.bandwidth")
+    for direction in ("rx", "tx")
+)
+WAN_BYTES: Final = tuple(
+    compile_key_chain(f"wan_ip_stats.wan.ip.stats.{direction}.bytes")
+    for direction in ("rx", "tx")
+)
+NUMBER_OF_BOOTS: Final = compile_key_chain("info.device.numberofboots")
+
+
+@dataclass(slots=True)
+class PendingWrite:
+    """Request changing the Bbox, waiting in the write queue."""
+
+    request: Callable[[], Awaitable[Any]]
+    section: str | None
+    confirmed: Callable[[], bool] | None
+    refresh: bool
+    future: asyncio.Future[None]
+
+
+def snapshot_store(hass: HomeAssistant, entry_id: str) -> Store[dict[str, Any]]:
+    """Return the store of the data snapshot of an entry."""
+    return Store(hass, SNAPSHOT_VERSION, f"{DOMAIN}.{entry_id}")
+
 
 class BboxDataUpdateCoordinator(DataUpdateCoordinator):
     """Define an object to fetch data."""
@@ -28,117 +163,877 @@ class BboxDataUpdateCoordinator(DataUpdateCoordinator):
         entry,
     ) -> None:
         """Class to manage fetching data API."""
-        super().__init__(
-            hass,
-            _LOGGER,
-            name=DOMAIN,
-            update_interval=timedelta(
-                seconds=entry.options.get(CONF_REFRESH_RATE, DEFAULT_REFRESH_RATE)
-            ),
-        )
+        super().__init__(hass, _LOGGER, name=DOMAIN)
         self.entry = entry
+        # Offset picked by the base class, used when retrying after a failure
+        self._retry_microsecond = self._microsecond
+        self.tier_intervals: dict[str, int] = {}
+        self._configured_intervals: dict[str, int] = {}
+        self._tier_refreshed: dict[str, float] = {}
+        self._scheduled = False
+        self._changes: set[Any] | None = None
+        self._last_full_write = 0.0
+        self.full_write_interval = DEFAULT_FULL_WRITE_INTERVAL
+        self.state_writes = {"performed": 0, "skipped": 0}
+        self.hosts: dict[str, Host] = {}
+        self._known_hosts: set[str] = set()
+        self._new_hosts: list[str] = []
+        self._hosts_listeners: list[Callable[[list[Host]], None]] = []
+        self._write_queue: deque[PendingWrite] = deque()
+        self._writer: asyncio.Task[None] | None = None
+        self.endpoint_metrics = {section: EndpointMetrics() for section in ENDPOINTS}
+        self.refresh_duration: float | None = None
+        self._cached_at: dict[str, float] = {}
+        self.merge_conflicts: list[str] = []
+        self._store = snapshot_store(hass, entry.entry_id)
+        self._snapshot_due: datetime | None = None
+        self.throughput = ThroughputBuffer()
+        self.section_updated: dict[str, float] = {}
+        self.stale_sections: set[str] = set()
+        self._expired: set[str] = set()
+        self.max_staleness = DEFAULT_MAX_STALENESS
+        self.cache_stats = {"hits": 0, "misses": 0}
+        self.breakers = {
+            section: CircuitBreaker() for section in ENDPOINTS if section != "info"
+        }
+        self.adaptive = DEFAULT_ADAPTIVE_REFRESH
+        self.interval_bounds = (DEFAULT_MIN_REFRESH_RATE, DEFAULT_MAX_REFRESH_RATE)
+        self._written_interval: int | None = None
+        self.request_timeout = DEFAULT_REQUEST_TIMEOUT
+        self.connections = {"created": 0, "reused": 0}
+        self.recorder: TrafficRecorder | None = None
+        self._recording: asyncio.Task[None] | None = None
+        self._client = async_get_client_slot(hass, entry.entry_id)
+        self._login_lock = asyncio.Lock()
+        self.scheduler = async_get_scheduler(hass)
+        self._unregister = self.scheduler.register(entry.entry_id)
+        self._load_options(entry.options)
+
+    def _load_options(self, options: Mapping[str, Any]) -> None:
+        """Apply refresh rates and request limit from options."""
+        self.tier_intervals = {
+            "fast": options.get(CONF_FAST_REFRESH_RATE, DEFAULT_FAST_REFRESH_RATE),
+            "medium": options.get(CONF_REFRESH_RATE, DEFAULT_REFRESH_RATE),
+            "slow": options.get(CONF_SLOW_REFRESH_RATE, DEFAULT_SLOW_REFRESH_RATE),
+        }
+        self._configured_intervals = dict(self.tier_intervals)
+        self.update_interval = timedelta(seconds=min(self.tier_intervals.values()))
+        self._semaphore = asyncio.Semaphore(
+            options.get(CONF_MAX_REQUESTS, DEFAULT_MAX_REQUESTS)
+        )
+        self.full_write_interval = options.get(
+            CONF_FULL_WRITE_INTERVAL, DEFAULT_FULL_WRITE_INTERVAL
+        )
+        self.max_staleness = options.get(CONF_MAX_STALENESS, DEFAULT_MAX_STALENESS)
+        self.merge_conflict = options.get(CONF_MERGE_CONFLICT, DEFAULT_MERGE_CONFLICT)
+        self.request_timeout = options.get(
+            CONF_REQUEST_TIMEOUT, DEFAULT_REQUEST_TIMEOUT
+        )
+        if not options.get(CONF_RECORD_TRAFFIC, DEFAULT_RECORD_TRAFFIC):
+            self.recorder = None
+        elif self.recorder is None:
+            self.recorder = TrafficRecorder(
+                Path(self.hass.config.path(f"{DOMAIN}_{self.entry.entry_id}.jsonl.gz"))
+            )
+        self.adaptive = options.get(CONF_ADAPTIVE_REFRESH, DEFAULT_ADAPTIVE_REFRESH)
+        self.interval_bounds = (
+            options.get(CONF_MIN_REFRESH_RATE, DEFAULT_MIN_REFRESH_RATE),
+            options.get(CONF_MAX_REFRESH_RATE, DEFAULT_MAX_REFRESH_RATE),
+        )
+        if self.adaptive:
+            self._set_adaptive_interval(self.tier_intervals["medium"])
+        # Refreshes may come a second early, as intervals are only honored to
+        # the second, the adaptive refresh may go down to the min bound
+        fastest = min(self._configured_intervals.values())
+        if self.adaptive:
+            fastest = min(fastest, self.interval_bounds[0])
+        self.throughput.resize(samples_for(fastest - TIER_TOLERANCE))
+
+    def _set_adaptive_interval(self, interval: float) -> None:
+        """Refresh the medium tier every interval, within bounds.
+
+        The fast tier is scaled alike from its own configured rate, it is not
+        refreshed more often than the min bound unless configured so.
+        """
+        low, high = self.interval_bounds
+        interval = round(min(max(interval, low), high))
+        self.tier_intervals["medium"] = interval
+        fast = self._configured_intervals["fast"]
+        scaled = fast * interval / self._configured_intervals["medium"]
+        self.tier_intervals["fast"] = round(min(max(scaled, min(fast, low)), high))
+        self.update_interval = timedelta(seconds=min(self.tier_intervals.values()))
+
+    def _adapt_interval(
+        self,
+        previous: dict[str, Any],
+        previous_hosts: dict[str, Host],
+        data: dict[str, Any],
+    ) -> None:
+        """Shorten the interval while data changes, back off otherwise."""
+        if self._box_loaded(data):
+            factor = ADAPTIVE_LOAD_BACKOFF
+        elif self._data_changing(previous, previous_hosts, data):
+            factor = ADAPTIVE_SPEEDUP
+        else:
+            factor = ADAPTIVE_BACKOFF
+        interval = self.tier_intervals["medium"]
+        self._set_adaptive_interval(interval * factor)
+        if self.tier_intervals["medium"] != interval:
+            _LOGGER.debug(
+                "Adaptive refresh interval: %ss", self.tier_intervals["medium"]
+            )
+
+    def _box_loaded(self, data: dict[str, Any]) -> bool:
+        """Return True if the Bbox is slow to answer or short of memory."""
+        if (self.refresh_duration or 0) > ADAPTIVE_SLOW_REFRESH:
+            return True
+        free = data.get("derived", {}).get("memory_free")
+        return free is not None and free < ADAPTIVE_LOW_MEMORY
+
+    def _data_changing(
+        self,
+        previous: dict[str, Any],
+        previous_hosts: dict[str, Host],
+        data: dict[str, Any],
+    ) -> bool:
+        """Return True if WAN bandwidth or active hosts changed."""
+        for bandwidth in BANDWIDTHS:
+            try:
+                old, new = float(bandwidth(previous)), float(bandwidth(data))
+            except (TypeError, ValueError):
+                continue
+            if abs(new - old) > ADAPTIVE_BANDWIDTH_CHANGE * max(old, 1):
+                return True
+
+        def active(hosts: dict[str, Host]) -> set[str]:
+            return {mac for mac, host in hosts.items() if host.active}
+
+        return active(previous_hosts) != active(self.hosts)
 
     async def _async_setup(self) -> None:
-        """Start Bbox connection."""
-        try:
-            self.bbox = Bbox(
-                password=self.entry.data[CONF_PASSWORD],
-                hostname=self.entry.data[CONF_HOST],
-                use_tls=self.entry.data.get(CONF_USE_TLS, False),
-                verify_ssl=self.entry.data.get(CONF_VERIFY_SSL, False),
+        """Get the Bbox client, logged in by the first refresh.
+
+        The client is kept across reloads while the credentials don't change,
+        over the session of the entry.
+        """
+        data = self.entry.data
+        verify_ssl = data.get(CONF_VERIFY_SSL, False)
+        credentials = (
+            data[CONF_HOST],
+            data[CONF_PASSWORD],
+            data.get(CONF_USE_TLS, False),
+            verify_ssl,
+        )
+        if self._client.credentials != credentials:
+            self._client.replace(
+                credentials,
+                Bbox(
+                    password=data[CONF_PASSWORD],
+                    hostname=data[CONF_HOST],
+                    session=async_get_session(
+                        self.hass, self.entry.entry_id, verify_ssl
+                    ),
+                    use_tls=data.get(CONF_USE_TLS, False),
+                    verify_ssl=verify_ssl,
+                ),
             )
-        except AuthorizationError as error:
-            raise ConfigEntryAuthFailed(
-                f"Password expired for {self.entry.data[CONF_HOST]}"
-            ) from error
+        self.bbox = self._client.client
+
+    async def _async_login(self, expired: int | None = None) -> None:
+        """Log in unless logged in, with a new client if expired is current.
+
+        expired is the generation of a client whose session was refused.
+        """
+        async with self._login_lock:
+            if expired == self._client.generation:
+                _LOGGER.debug("Session expired, new login to the Bbox")
+                self._client.credentials = None
+                await self._async_setup()
+            if self._client.authenticated:
+                return
+            try:
+                async with self._request_timeout():
+                    await self.bbox.async_auth()
+            except AuthorizationError as error:
+                raise ConfigEntryAuthFailed(
+                    f"Password expired for {self.entry.data[CONF_HOST]}"
+                ) from error
+            self._client.record_login()
+            _LOGGER.debug("Logged in %s", self.entry.data[CONF_HOST])
+
+    async def async_restore_snapshot(self) -> bool:
+        """Start from the last snapshot saved, return False if there is none."""
+        snapshot = await self._store.async_load()
+        if not snapshot or not isinstance(snapshot.get("info"), dict):
+            return False
+        await self._async_setup()
+        sections = [section for section in ENDPOINTS if section in snapshot]
+        self.data = self._merge_sections(
+            sections, [snapshot[section] for section in sections]
+        )
+        # Hosts of the snapshot are added with the entities of the platforms
+        self._new_hosts = []
+        _LOGGER.debug("Data restored from snapshot (%s)", sections)
+        return True
 
     async def update_configuration(
         self, hass: HomeAssistant, entry: ConfigEntry
     ) -> None:
         """Update configuration."""
-        self.update_interval = timedelta(seconds=entry.options[CONF_REFRESH_RATE])
-        _LOGGER.debug("Coordinator refresh interval updated (%s)", self.update_interval)
+        self._load_options(entry.options)
+        _LOGGER.debug("Coordinator refresh intervals updated (%s)", self.tier_intervals)
 
         await self.async_refresh()
 
+    async def _async_refresh(
+        self, *args: Any, scheduled: bool = False, **kwargs: Any
+    ) -> None:
+        """Refresh data, scheduled refreshes only fetch the tiers due.
+
+        Scheduled refreshes of all entries share a concurrency limit.
+        """
+        if not scheduled:
+            self._scheduled = False
+            await super()._async_refresh(*args, **kwargs)
+            return
+        async with self.scheduler.slot():
+            self._scheduled = True
+            await super()._async_refresh(*args, scheduled=True, **kwargs)
+
+    @callback
+    def _schedule_refresh(self) -> None:
+        """Schedule the next refresh at the phase of the entry in the cycle.
+
+        A retry after a failed update is scheduled retry_after from now.
+        """
+        if self._retry_after is not None:
+            self._microsecond = self._retry_microsecond
+        elif self._unregister is not None and self._update_interval_seconds is not None:
+            now = self.hass.loop.time()
+            next_refresh = self.scheduler.next_refresh(
+                self.entry.entry_id, now, self._update_interval_seconds
+            )
+            # Offset from the time the base class schedules the refresh at
+            self._microsecond = next_refresh - int(now) - self._update_interval_seconds
+        super()._schedule_refresh()
+
+    def _tiers_due(self) -> list[str]:
+        """Return the tiers to refresh."""
+        if self.data is None or not self._scheduled:
+            return list(TIERS)
+        now = monotonic()
+        return [
+            tier
+            for tier, interval in self.tier_intervals.items()
+            if now - self._tier_refreshed.get(tier, 0) + TIER_TOLERANCE >= interval
+        ]
+
     async def _async_update_data(self) -> dict[str, dict[str, Any]]:
         """Fetch data."""
+        self._changes = None
+        tiers = self._tiers_due()
+        started = monotonic()
+        sections = [
+            section
+            for tier in tiers
+            for section in TIERS[tier]
+            if not self._cache_hit(section, started)
+        ]
+        connections = async_get_connection_stats(self.hass, self.entry.data[CONF_HOST])
         try:
-            bbox_info = self.check_list(await self.bbox.device.async_get_bbox_info())
-            memory = self.check_list(
-                await self._call(self.bbox.device.async_get_bbox_mem)
-            )
-            led = self.check_list(await self._call(self.bbox.device.async_get_bbox_led))
-            devices = await self._call(self.bbox.lan.async_get_connected_devices)
-            wan_ip_stats = self.check_list(
-                await self._call(self.bbox.wan.async_get_wan_ip_stats)
-            )
-            parentalcontrol = self.check_list(
-                await self._call(
-                    self.bbox.parentalcontrol.async_get_parental_control_service_state
-                )
-            )
-            wps = self.check_list(await self._call(self.bbox.wifi.async_get_wps))
-            wifi = self.check_list(await self._call(self.bbox.wifi.async_get_wireless))
-            wan_ip = self.check_list(await self._call(self.bbox.wan.async_get_wan_ip))
+            async with self._semaphore:
+                await self._async_login()
+            results = await self._async_get_sections(sections)
         except BboxException as error:
             _LOGGER.error(error)
+            if self.adaptive:
+                self._set_adaptive_interval(
+                    self.tier_intervals["medium"] * ADAPTIVE_LOAD_BACKOFF
+                )
             raise UpdateFailed from error
+        finally:
+            self.refresh_duration = round((monotonic() - started) * 1000, 1)
+            self.connections = {
+                key: count - connections[key]
+                for key, count in async_get_connection_stats(
+                    self.hass, self.entry.data[CONF_HOST]
+                ).items()
+            }
+
+        for tier in tiers:
+            self._tier_refreshed[tier] = started
+        if self.recorder is not None:
+            # Written in the background, the refresh does not wait for the disk
+            self._recording = self.entry.async_create_background_task(
+                self.hass,
+                self._async_write_recording(
+                    self.recorder, self.recorder.take(), self._recording
+                ),
+                f"{DOMAIN} recording",
+            )
+        fetched = [
+            (section, result)
+            for section, result in zip(sections, results, strict=True)
+            if result is not None
+        ]
+        sections = [section for section, _ in fetched]
+        for section in sections:
+            if section in CACHE_TTL:
+                self._cached_at[section] = started
+        if "wan_ip_stats" in sections:
+            self._sample_throughput(started, {**(self.data or {}), **dict(fetched)})
+        previous, previous_hosts = self.data, self.hosts
+        data = self._merge_sections(sections, [result for _, result in fetched])
+        self._update_expired()
+        if (
+            previous is not None
+            and "wan_ip_stats" in sections
+            and self._wan_reset(previous, data)
+        ):
+            _LOGGER.debug("WAN counters reset, WAN address and info fetched again")
+            self.async_invalidate_cache("wan_ip", "info")
+        if self.adaptive and previous is not None and "medium" in tiers:
+            self._adapt_interval(previous, previous_hosts, data)
+        return data
+
+    async def _async_write_recording(
+        self,
+        recorder: TrafficRecorder,
+        sections: dict[str, str],
+        previous: asyncio.Task[None] | None,
+    ) -> None:
+        """Append the sections of a refresh to the recording, in order."""
+        if previous is not None:
+            await previous
+        try:
+            await self.hass.async_add_executor_job(recorder.write, sections)
+        except OSError as error:
+            _LOGGER.warning("Unable to record the responses (%s)", error)
 
+    def _sample_throughput(self, time: float, data: dict[str, Any]) -> None:
+        """Add the WAN byte counters of data to the throughput buffer."""
         try:
-            speedtest_infos = self.check_list(
-                await self.bbox.speedtest.async_get_speedtest_infos()
+            rx, tx = (float(counter(data)) for counter in WAN_BYTES)
+        except (TypeError, ValueError):
+            return
+        self.throughput.add(time, rx, tx, NUMBER_OF_BOOTS(data))
+
+    def _update_expired(self) -> None:
+        """Write entities of sections which expired or were fetched again."""
+        expired = {
+            section for section in self.stale_sections if self.section_expired(section)
+        }
+        flipped = expired ^ self._expired
+        self._expired = expired
+        if not flipped or self._changes is None:
+            return
+        _LOGGER.debug("Expired sections: %s", expired)
+        self._changes.update(flipped)
+        if "devices" in flipped:
+            self._changes.update(("devices", mac) for mac in self.hosts)
+
+    def _cache_hit(self, section: str, now: float) -> bool:
+        """Return True if the cached section is recent enough to be kept.
+
+        Only scheduled refreshes use the cache, a requested refresh fetches
+        every section.
+        """
+        if (ttl := CACHE_TTL.get(section)) is None:
+            return False
+        cached_at = self._cached_at.get(section)
+        if self._scheduled and cached_at is not None and now - cached_at < ttl:
+            self.cache_stats["hits"] += 1
+            return True
+        self.cache_stats["misses"] += 1
+        return False
+
+    @callback
+    def async_invalidate_cache(self, *sections: str) -> None:
+        """Fetch cached sections (all if none given) on the next refresh."""
+        for section in sections or CACHE_TTL:
+            self._cached_at.pop(section, None)
+            for tier, tier_sections in TIERS.items():
+                if section in tier_sections:
+                    self._tier_refreshed.pop(tier, None)
+
+    @staticmethod
+    def _wan_reset(previous: dict[str, Any], data: dict[str, Any]) -> bool:
+        """Return True if WAN byte counters went backwards (WAN reconnected)."""
+        for counter in WAN_BYTES:
+            try:
+                if float(counter(data)) < float(counter(previous)):
+                    return True
+            except (TypeError, ValueError):
+                continue
+        return False
+
+    def _merge_sections(
+        self, sections: list[str], results: list[dict[str, Any]]
+    ) -> dict[str, Any]:
+        """Return data updated with sections and record what changed.
+
+        Values derived from the sections are computed again under "derived".
+        """
+        data = {**(self.data or {}), **dict(zip(sections, results, strict=True))}
+        if derived := compute_derived(data, sections):
+            if "wan_ip_stats" in sections:
+                derived.update(self.throughput.values())
+            data["derived"] = {**data.get("derived", {}), **derived}
+        hosts = self.hosts
+        if "devices" in sections:
+            self.hosts = self.index_hosts(data["devices"])
+            data["devices"] = self.drop_host_list(data["devices"])
+            self._new_hosts = [
+                mac for mac in self.hosts if mac not in self._known_hosts
+            ]
+            self._known_hosts.update(self._new_hosts)
+
+        if self._full_write_due(now := monotonic()):
+            self._last_full_write = now
+            self._changes = None
+        else:
+            self._changes = self.diff(self.data, data, sections, hosts, self.hosts)
+        return data
+
+    @callback
+    def async_set_sections(
+        self, sections: list[str], results: list[dict[str, Any]]
+    ) -> None:
+        """Update sections of data without a full refresh.
+
+        Only the listeners of the sections are updated, the polling schedule
+        is kept.
+        """
+        self.data = self._merge_sections(sections, results)
+        self.async_update_listeners()
+        self._async_refresh_finished()
+
+    async def async_confirm_sections(
+        self, sections: list[str], confirmed: Callable[[], bool]
+    ) -> bool:
+        """Read sections again until confirmed returns True.
+
+        Sections are read with an exponential backoff, each response updates
+        data. Return False if the change is not confirmed before the deadline.
+        """
+        delay = CONFIRM_DELAY
+        deadline = monotonic() + CONFIRM_TIMEOUT
+        while True:
+            await asyncio.sleep(delay)
+            results = await asyncio.gather(
+                *(self._async_get_section(section) for section in sections),
+                return_exceptions=True,
+            )
+            read: list[str] = []
+            values: list[dict[str, Any]] = []
+            for section, result in zip(sections, results, strict=True):
+                if isinstance(result, BaseException):
+                    _LOGGER.debug("Error while reading %s (%s)", section, result)
+                    continue
+                if result is None:
+                    continue
+                read.append(section)
+                values.append(result)
+            if read:
+                self.async_set_sections(read, values)
+            if confirmed():
+                return True
+            delay *= 2
+            if monotonic() + delay > deadline:
+                _LOGGER.debug("Change of %s not confirmed", sections)
+                return False
+
+    async def async_write(
+        self,
+        api: str,
+        method: str,
+        section: str | None = None,
+        confirmed: Callable[[], bool] | None = None,
+        refresh: bool = False,
+        **kwargs: Any,
+    ) -> None:
+        """Queue api.method changing the Bbox, return once it is confirmed.
+
+        Writes are sent one at a time, logging in again once if the session
+        expired, apart from the requests limit of the
+        reads. Once no write came for WRITE_SETTLE_DELAY, the sections written
+        are read again until every change is confirmed, and all sections are
+        refreshed if a write asked so.
+        """
+        future: asyncio.Future[None] = self.hass.loop.create_future()
+        self._write_queue.append(
+            PendingWrite(
+                partial(self._async_fetch, api, method, **kwargs),
+                section,
+                confirmed,
+                refresh,
+                future,
+            )
+        )
+        if self._writer is None or self._writer.done():
+            self._writer = self.entry.async_create_background_task(
+                self.hass, self._async_drain_writes(), f"{DOMAIN} writes"
+            )
+        await future
+
+    async def _async_drain_writes(self) -> None:
+        """Send the queued writes, then confirm those of each burst together."""
+        while self._write_queue:
+            sent: list[PendingWrite] = []
+            try:
+                while self._write_queue:
+                    await self._async_send_writes(sent)
+                    if sent:
+                        await asyncio.sleep(WRITE_SETTLE_DELAY)
+                await self._async_confirm_writes(sent)
+            finally:
+                for write in sent:
+                    if not write.future.done():
+                        write.future.set_result(None)
+
+    async def _async_send_writes(self, sent: list[PendingWrite]) -> None:
+        """Send the queued writes one at a time, add those to confirm to sent."""
+        while self._write_queue:
+            write = self._write_queue.popleft()
+            try:
+                async with self._request_timeout():
+                    await write.request()
+            except Exception as error:  # noqa: BLE001
+                if not write.future.done():
+                    write.future.set_exception(error)
+                continue
+            if write.section is not None or write.refresh:
+                sent.append(write)
+            elif not write.future.done():
+                write.future.set_result(None)
+
+    async def _async_confirm_writes(self, writes: list[PendingWrite]) -> None:
+        """Confirm the writes of a burst with one read of each section."""
+        if sections := list(
+            dict.fromkeys(write.section for write in writes if write.section)
+        ):
+            await self.async_confirm_sections(
+                sections,
+                lambda: all(write.confirmed() for write in writes if write.confirmed),
             )
+        if any(write.refresh for write in writes):
+            self.async_invalidate_cache()
+            await self.async_request_refresh()
+
+    async def async_shutdown(self) -> None:
+        """Cancel queued writes and scheduled calls, save the snapshot."""
+        if self._unregister:
+            self._unregister()
+            self._unregister = None
+        if self._writer is not None:
+            self._writer.cancel()
+            self._writer = None
+        for write in self._write_queue:
+            write.future.cancel()
+        self._write_queue.clear()
+        if self._snapshot_due is not None:
+            # Write the pending snapshot now, a removal of the entry follows
+            self._snapshot_due = None
+            await self._store.async_save(self._snapshot_data())
+        await super().async_shutdown()
+
+    def _full_write_due(self, now: float) -> bool:
+        """Return True if all entities must be written."""
+        return (
+            self.data is None
+            or not self.last_update_success
+            or now - self._last_full_write >= self.full_write_interval
+        )
+
+    @staticmethod
+    def diff(
+        previous: dict[str, Any],
+        data: dict[str, Any],
+        sections: list[str],
+        previous_hosts: dict[str, Host],
+        hosts: dict[str, Host],
+    ) -> set[Any]:
+        """Return changed sections and ("devices", mac) of changed hosts.
+
+        An object returned again as is may have been modified in place, it is
+        then considered changed. Hosts are new records on each refresh of
+        devices, compared by value.
+        """
+        changes: set[Any] = {
+            section
+            for section in sections
+            if (old := previous.get(section)) is data[section] or old != data[section]
+        }
+        if "devices" in sections:
+            changed_hosts = {
+                ("devices", mac)
+                for mac in previous_hosts.keys() | hosts.keys()
+                if previous_hosts.get(mac) != hosts.get(mac)
+            }
+            if changed_hosts:
+                changes.add("devices")
+                changes.update(changed_hosts)
+        return changes
+
+    async def _async_get_sections(
+        self, sections: list[str]
+    ) -> list[dict[str, Any] | None]:
+        """Fetch sections together, the others are cancelled if one raises."""
+        tasks = [
+            asyncio.create_task(self._async_get_section(section))
+            for section in sections
+        ]
+        try:
+            return await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+
+    async def _async_get_section(self, section: str) -> dict[str, Any] | None:
+        """Fetch a section of data and record the latency of the request.
+
+        Return None if the section failed or its response is unexpected, or
+        conflicting under the raise policy, its previous value is then kept as
+        stale. Apart from info, a section failing repeatedly is skipped until
+        its circuit breaker lets a new request through.
+        """
+        api, method = ENDPOINTS[section]
+        breaker = self.breakers.get(section)
+        if breaker and not breaker.allow():
+            _LOGGER.debug("Skipping %s, the endpoint keeps failing", method)
+            self.stale_sections.add(section)
+            return None
+        try:
+            async with self._semaphore:
+                with self.endpoint_metrics[section].measure():
+                    async with self._request_timeout():
+                        result = await self._async_fetch(api, method)
         except BboxException as error:
-            _LOGGER.warning("SpeedTest Module not found (%s)", error)
-            speedtest_infos = {}
+            if breaker is None:
+                raise
+            if (task := asyncio.current_task()) and task.cancelling():
+                # The refresh failed, bboxpy turned the cancellation into an error
+                raise asyncio.CancelledError from error
+            opened = breaker.failures >= breaker.threshold
+            if (backoff := breaker.record_failure()) is not None:
+                _LOGGER.log(
+                    logging.DEBUG if opened else logging.WARNING,
+                    "Error while execute: %s (%s), skipped for %ss",
+                    method,
+                    error,
+                    backoff,
+                )
+            elif section == "speedtest_infos":
+                # The module is missing on some models
+                _LOGGER.warning("SpeedTest Module not found (%s)", error)
+            else:
+                _LOGGER.warning("Error while execute: %s (%s)", method, error)
+            self.stale_sections.add(section)
+            return None
+        if self.recorder is not None:
+            self.recorder.add(section, result)
+        try:
+            if section == "devices":
+                conflicts: list[str] = []
+                value = self.merge_objects(result, self.merge_conflict, conflicts)
+                if conflicts:
+                    _LOGGER.debug("Conflicts merging %s: %s", method, conflicts)
+                self.merge_conflicts = conflicts
+            else:
+                value = self.check_list(result)
+        except (UpdateFailed, ValueError) as error:
+            if breaker is None:
+                raise
+            _LOGGER.warning("Unexpected response of %s (%s)", method, error)
+            self.stale_sections.add(section)
+            return None
+        if breaker:
+            breaker.record_success()
+        self.section_updated[section] = monotonic()
+        self.stale_sections.discard(section)
+        return value
+
+    async def _async_fetch(self, api: str, method: str, **kwargs: Any) -> Any:
+        """Request api.method, logging in again once if the session expired.
+
+        The method is looked up again on the client of the new login.
+        """
+        generation = self._client.generation
+        try:
+            return await getattr(getattr(self.bbox, api), method)(**kwargs)
+        except AuthorizationError:
+            await self._async_login(expired=generation)
+            return await getattr(getattr(self.bbox, api), method)(**kwargs)
+
+    def logins_per_hour(self) -> int:
+        """Return the number of logins to the Bbox during the last hour."""
+        return self._client.logins_per_hour()
+
+    def section_age(self, section: str) -> float | None:
+        """Return the time (in seconds) since the section was last fetched."""
+        if (updated := self.section_updated.get(section)) is None:
+            return None
+        return monotonic() - updated
 
+    def section_state(self, section: str) -> dict[str, Any]:
+        """Return the age (in seconds) of the section and if it is stale."""
+        age = self.section_age(section)
         return {
-            "info": bbox_info,
-            "memory": memory,
-            "led": led,
-            "devices": self.merge_objects(devices),
-            "wan_ip_stats": wan_ip_stats,
-            "parentalcontrol": parentalcontrol,
-            "wps": wps,
-            "wifi": wifi,
-            "wan_ip": wan_ip,
-            "speedtest_infos": speedtest_infos,
+            "age": None if age is None else round(age),
+            "stale": section in self.stale_sections,
         }
 
+    def section_expired(self, section: str) -> bool:
+        """Return True if the section failed for longer than max staleness."""
+        if section not in self.stale_sections:
+            return False
+        age = self.section_age(section)
+        return age is None or age > self.max_staleness
+
+    @callback
+    def async_add_hosts_listener(
+        self, add_hosts: Callable[[list[Host]], None]
+    ) -> CALLBACK_TYPE:
+        """Call add_hosts with the current hosts, then with each new host seen."""
+        add_hosts(list(self.hosts.values()))
+        self._hosts_listeners.append(add_hosts)
+
+        @callback
+        def remove_listener() -> None:
+            self._hosts_listeners.remove(add_hosts)
+
+        return remove_listener
+
+    @callback
+    def _async_refresh_finished(self) -> None:
+        """Save a snapshot of data and notify hosts listeners of new hosts.
+
+        A snapshot is saved SNAPSHOT_SAVE_DELAY after the first refresh since
+        the last one, refreshes in between do not push the save back.
+        """
+        if self.last_update_success and self.data is not None:
+            now = dt_util.utcnow()
+            if self._snapshot_due is None or self._snapshot_due <= now:
+                self._snapshot_due = now + timedelta(seconds=SNAPSHOT_SAVE_DELAY)
+            self._store.async_delay_save(
+                self._snapshot_data, (self._snapshot_due - now).total_seconds()
+            )
+        if not self._new_hosts:
+            return
+        hosts = [self.hosts[mac] for mac in self._new_hosts]
+        self._new_hosts = []
+        _LOGGER.debug("New hosts found: %s", len(hosts))
+        for add_hosts in list(self._hosts_listeners):
+            add_hosts(hosts)
+
+    def _snapshot_data(self) -> dict[str, Any]:
+        """Return data with the records of the hosts as the list of hosts."""
+        if "devices" not in self.data:
+            return self.data
+        devices = self.data["devices"]
+        hosts = [host.as_dict() for host in self.hosts.values()]
+        return {
+            **self.data,
+            "devices": {**devices, "hosts": {**devices["hosts"], "list": hosts}},
+        }
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Update listeners whose section or host changed.
+
+        Listeners registered without context are always updated, as are all
+        listeners when the update does not come from a refresh.
+        """
+        changes = self._changes
+        self._changes = None
+        interval = self.tier_intervals["medium"]
+        if changes is not None and interval != self._written_interval:
+            changes.add("refresh_interval")
+        self._written_interval = interval
+        performed = skipped = 0
+        for update_callback, context in list(self._listeners.values()):
+            if changes is None or context is None or context in changes:
+                update_callback()
+                performed += 1
+            else:
+                skipped += 1
+        self.state_writes = {"performed": performed, "skipped": skipped}
+        _LOGGER.debug("State writes performed: %s, skipped: %s", performed, skipped)
+
     @staticmethod
-    def merge_objects(objs: Any) -> dict[str, Any]:
-        """Merge objects return by the Bbox API."""
-        assert isinstance(objs, list)
-
-        def merge(a: dict, b: dict, path=[]):
-            for key in b:
-                if key in a:
-                    if isinstance(a[key], dict) and isinstance(b[key], dict):
-                        merge(a[key], b[key], path + [str(key)])
-                    elif isinstance(a[key], list) and isinstance(b[key], list):
-                        a[key].extend(b[key])
-                    elif a[key] != b[key]:
-                        raise ValueError(
-                            f"Conflict merging the key {'.'.join(path + [str(key)])} of the "
-                            "objects return by the Bbox API: "
-                            f"'{a[key]}' ({type(a[key])}) != '{b[key]}' ({type(b[key])})"
-                        )
-                else:
-                    a[key] = b[key]
-            return a
+    def merge_objects(
+        objs: Any,
+        conflict: str = CONFLICT_RAISE,
+        conflicts: list[str] | None = None,
+    ) -> dict[str, Any]:
+        """Merge objects return by the Bbox API into the first one.
 
-        result = objs[0]
-        assert isinstance(result, dict), (
-            f"The first element of the list is not a dict (but {type(result)}): {result}"
-        )
-        for idx, obj in enumerate(objs[1:]):
-            assert isinstance(obj, dict), (
-                f"The {idx + 2} element of the list is not a dict (but {type(obj)}): {obj}"
+        Dicts are merged recursively and lists concatenated. Different scalar
+        values raise ValueError, keep the last value or keep the first value
+        and are appended to conflicts, depending on the conflict policy.
+        """
+        if not isinstance(objs, list) or not objs:
+            raise UpdateFailed(
+                f"The call is not a non empty list ({type(objs)}): {objs}"
             )
-            result = merge(result, obj)
+        for idx, obj in enumerate(objs):
+            if not isinstance(obj, dict):
+                raise UpdateFailed(
+                    f"The element {idx + 1} is not a dict ({type(obj)}): {obj}"
+                )
+
+        # Keys leading to the objects being merged, joined only to report conflicts
+        path: list[str] = []
+
+        def merge(a: dict[str, Any], b: dict[str, Any]) -> None:
+            for key, value in b.items():
+                if (current := a.get(key, _MISSING)) is _MISSING:
+                    a[key] = value
+                elif isinstance(current, dict) and isinstance(value, dict):
+                    path.append(str(key))
+                    merge(current, value)
+                    path.pop()
+                elif isinstance(current, list) and isinstance(value, list):
+                    current.extend(value)
+                elif current != value:
+                    if conflict == CONFLICT_LAST_WINS:
+                        a[key] = value
+                        continue
+                    message = (
+                        f"Conflict merging the key {'.'.join([*path, str(key)])} of "
+                        "the objects return by the Bbox API: "
+                        f"'{current}' ({type(current)}) != '{value}' ({type(value)})"
+                    )
+                    if conflict != CONFLICT_COLLECT:
+                        raise ValueError(message)
+                    if conflicts is not None:
+                        conflicts.append(message)
+
+        result = objs[0]
+        for idx in range(1, len(objs)):
+            merge(result, objs[idx])
         return result
 
+    @staticmethod
+    def index_hosts(devices: dict[str, Any]) -> dict[str, Host]:
+        """Return records of the hosts indexed by mac address, in one pass."""
+        return {
+            host["macaddress"]: Host.from_payload(host)
+            for host in devices.get("hosts", {}).get("list", [])
+            if host.get("macaddress")
+        }
+
+    @staticmethod
+    def drop_host_list(devices: dict[str, Any]) -> dict[str, Any]:
+        """Return devices without the raw list of hosts, kept as records."""
+        hosts = devices.get("hosts", {})
+        return {
+            **devices,
+            "hosts": {key: value for key, value in hosts.items() if key != "list"},
+        }
+
     @staticmethod
     def check_list(obj: Any) -> dict[str, Any]:
         """Return element if one only."""
@@ -150,10 +1045,18 @@ class BboxDataUpdateCoordinator(DataUpdateCoordinator):
             )
         return obj[0]
 
-    async def _call(self, func: Callable[..., Any], *args: Any) -> dict[str, Any]:
-        """Execute request."""
+    @asynccontextmanager
+    async def _request_timeout(self) -> AsyncIterator[None]:
+        """Abandon a request without response within the request timeout."""
         try:
-            return await func(*args)
-        except BboxException as error:
-            _LOGGER.warning("Error while execute: %s (%s)", func.__name__, error)
-        return {}
+            async with asyncio.timeout(self.request_timeout):
+                yield
+        except TimeoutError as error:
+            raise TimeoutExceededError(
+                f"No response from the Bbox within {self.request_timeout}s"
+            ) from error
+
+    async def async_request(self, api: str, method: str, **kwargs: Any) -> Any:
+        """Request api.method, bounded by the concurrent requests limit."""
+        async with self._semaphore, self._request_timeout():
+            return await self._async_fetch(api, method, **kwargs)
@@ -0,0 +1,61 @@
+"""Values derived from the data of the Bbox, computed once per refresh."""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from typing import Any, Final
+
+from .helpers import compile_key_chain
+
+type DerivedValue = Callable[[dict[str, Any]], Any]
+
+
+def percentage(value_key: str, total_key: str) -> DerivedValue:
+    """Return a function computing value_key in percent of total_key."""
+    value = compile_key_chain(value_key)
+    total = compile_key_chain(total_key)
+    return lambda data: float(value(data)) * 100 / float(total(data))
+
+
+def kilobits(key: str) -> DerivedValue:
+    """Return a function converting the bits of key into kilobits."""
+    value = compile_key_chain(key)
+    return lambda data: round(float(value(data)) / 1000, 2)
+
+
+# Name => (section the value is derived from, function of data)
+DERIVED_VALUES: Final[dict[str, tuple[str, DerivedValue]]] = {
+    "rx_occupation": (
+        "wan_ip_stats",
+        percentage(
+            "wan_ip_stats.wan.ip.stats.rx.bandwidth",
+            "wan_ip_stats.wan.ip.stats.rx.maxBandwidth",
+        ),
+    ),
+    "tx_occupation": (
+        "wan_ip_stats",
+        percentage(
+            "wan_ip_stats.wan.ip.stats.tx.bandwidth",
+            "wan_ip_stats.wan.ip.stats.tx.maxBandwidth",
+        ),
+    ),
+    "rx_kilobits": ("wan_ip_stats", kilobits("wan_ip_stats.wan.ip.stats.rx.bytes")),
+    "tx_kilobits": ("wan_ip_stats", kilobits("wan_ip_stats.wan.ip.stats.tx.bytes")),
+    "memory_free": (
+        "memory",
+        percentage("memory.device.mem.free", "memory.device.mem.total"),
+    ),
+}
+
+
+def compute_derived(data: dict[str, Any], sections: list[str]) -> dict[str, Any]:
+    """Return the values derived from sections, None if they can't be computed."""
+    derived: dict[str, Any] = {}
+    for name, (section, derive) in DERIVED_VALUES.items():
+        if section not in sections:
+            continue
+        try:
+            derived[name] = derive(data)
+        except (TypeError, ValueError, ZeroDivisionError):
+            derived[name] = None
+    return derived
@@ -2,17 +2,16 @@
 
 from __future__ import annotations
 
-from typing import Any
-
 from homeassistant.components.device_tracker import SourceType
 from homeassistant.components.device_tracker.config_entry import ScannerEntity
 from homeassistant.components.sensor import SensorEntityDescription
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
 from . import BBoxConfigEntry
 from .coordinator import BboxDataUpdateCoordinator
 from .entity import BboxDeviceEntity
+from .hosts import Host
 
 
 async def async_setup_entry(
@@ -21,13 +20,15 @@ async def async_setup_entry(
     """Set up sensor."""
     coordinator = entry.runtime_data
     description = SensorEntityDescription(key="tracker", translation_key="tracker")
-    devices = coordinator.data.get("devices", {}).get("hosts", {}).get("list", [])
-    entities = [
-        BboxDeviceTracker(coordinator, description, device)
-        for device in devices
-        if device.get("macaddress")
-    ]
-    async_add_entities(entities)
+
+    @callback
+    def async_add_hosts(devices: list[Host]) -> None:
+        """Add trackers of new hosts."""
+        async_add_entities(
+            BboxDeviceTracker(coordinator, description, device) for device in devices
+        )
+
+    entry.async_on_unload(coordinator.async_add_hosts_listener(async_add_hosts))
 
 
 class BboxDeviceTracker(BboxDeviceEntity, ScannerEntity):
@@ -39,7 +40,7 @@ class BboxDeviceTracker(BboxDeviceEntity, ScannerEntity):
         self,
         coordinator: BboxDataUpdateCoordinator,
         description: SensorEntityDescription,
-        device: dict[str, Any],
+        device: Host,
     ) -> None:
         """Initialize."""
         super().__init__(coordinator, description, device)
@@ -52,14 +53,14 @@ class BboxDeviceTracker(BboxDeviceEntity, ScannerEntity):
     @property
     def mac_address(self) -> str:
         """Return mac address."""
-        return self._device["macaddress"]
+        return self._mac
 
     @property
-    def ip_address(self) -> str:
-        """Return mac address."""
-        return self._device["ipaddress"]
+    def ip_address(self) -> str | None:
+        """Return ip address, None once the host left the Bbox."""
+        return self._device.ipaddress
 
     @property
     def is_connected(self) -> bool:
         """Return connecting status."""
-        return self._device.get("active", 0) == 1
+        return self._device.active == 1
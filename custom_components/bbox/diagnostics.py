@@ -2,16 +2,43 @@
 
 from __future__ import annotations
 
-from collections.abc import Callable
-from contextlib import suppress
-from typing import Any
+import asyncio
+import json
+from time import monotonic
+from typing import Any, Final
 
+from bboxpy import TimeoutExceededError
 from homeassistant.components.diagnostics import async_redact_data
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
 
 from .const import TO_REDACT
 
+# Time (in seconds) allowed to collect all endpoints
+DIAGNOSTICS_TIMEOUT = 8
+
+# (api, method) of the Bbox client
+DIAGNOSTICS_ENDPOINTS: Final[tuple[tuple[str, str], ...]] = (
+    ("device", "async_get_bbox_summary"),
+    ("device", "async_get_bbox_info"),
+    ("ddns", "async_get_ddns"),
+    ("iptv", "async_get_iptv_info"),
+    ("lan", "async_get_connected_devices"),
+    ("lan", "async_get_device_infos"),
+    ("lan", "async_get_lan_stats"),
+    ("parentalcontrol", "async_get_parental_control_service_state"),
+    ("services", "async_get_bbox_services"),
+    ("voip", "async_get_voip_voicemail"),
+    ("wifi", "async_get_wireless"),
+    ("wifi", "async_get_stats_5"),
+    ("wifi", "async_get_stats_24"),
+    ("wifi", "async_get_wps"),
+    ("wifi", "async_get_repeater"),
+    ("wan", "async_get_wan_ip"),
+    ("wan", "async_get_wan_ftth"),
+    ("wan", "async_get_wan_ip_stats"),
+)
+
 
 async def async_get_config_entry_diagnostics(
     hass: HomeAssistant, entry: ConfigEntry
@@ -19,40 +46,45 @@ async def async_get_config_entry_diagnostics(
     """Return diagnostics for a config entry."""
     coordinator = entry.runtime_data
 
-    _datas = {}
+    _datas: dict[str, Any] = {method: {} for _, method in DIAGNOSTICS_ENDPOINTS}
+    _requests: dict[str, dict[str, Any]] = {
+        method: {"status": "timeout", "latency": DIAGNOSTICS_TIMEOUT}
+        for _, method in DIAGNOSTICS_ENDPOINTS
+    }
 
-    async def diag(func: Callable[..., Any], *args: Any) -> None:
-        rslt = {}
-        with suppress(Exception):
-            rsp = await func(*args)
+    async def diag(api: str, method: str) -> None:
+        start = monotonic()
+        try:
+            rsp = await coordinator.async_request(api, method)
             rslt = (
                 rsp
                 if isinstance(rsp, dict | list | set | float | int | str | tuple)
                 else vars(rsp)
             )
+        except Exception as error:  # noqa: BLE001
+            _requests[method] = {
+                "status": "timeout"
+                if isinstance(error, TimeoutExceededError)
+                else "error",
+                "latency": round(monotonic() - start, 3),
+                "error": repr(error),
+            }
+            return
 
-        _datas.update({func.__name__: rslt})
+        _datas[method] = rslt
+        _requests[method] = {
+            "status": "ok",
+            "latency": round(monotonic() - start, 3),
+            "size": len(json.dumps(rslt, default=str)),
+        }
 
-    await diag(coordinator.bbox.device.async_get_bbox_summary)
-    await diag(coordinator.bbox.device.async_get_bbox_info)
-    await diag(coordinator.bbox.ddns.async_get_ddns)
-    await diag(coordinator.bbox.iptv.async_get_iptv_info)
-    await diag(coordinator.bbox.lan.async_get_connected_devices)
-    await diag(coordinator.bbox.lan.async_get_device_infos)
-    await diag(coordinator.bbox.lan.async_get_lan_stats)
-    await diag(
-        coordinator.bbox.parentalcontrol.async_get_parental_control_service_state
-    )
-    await diag(coordinator.bbox.services.async_get_bbox_services)
-    await diag(coordinator.bbox.voip.async_get_voip_voicemail)
-    await diag(coordinator.bbox.wifi.async_get_wireless)
-    await diag(coordinator.bbox.wifi.async_get_stats_5)
-    await diag(coordinator.bbox.wifi.async_get_stats_24)
-    await diag(coordinator.bbox.wifi.async_get_wps)
-    await diag(coordinator.bbox.wifi.async_get_repeater)
-    await diag(coordinator.bbox.wan.async_get_wan_ip)
-    await diag(coordinator.bbox.wan.async_get_wan_ftth)
-    await diag(coordinator.bbox.wan.async_get_wan_ip_stats)
+    tasks = [
+        asyncio.create_task(diag(api, method)) for api, method in DIAGNOSTICS_ENDPOINTS
+    ]
+    _, pending = await asyncio.wait(tasks, timeout=DIAGNOSTICS_TIMEOUT)
+    for task in pending:
+        task.cancel()
+    await asyncio.gather(*pending, return_exceptions=True)
 
     return {
         "entry": {
@@ -60,5 +92,27 @@ async def async_get_config_entry_diagnostics(
             "options": async_redact_data(entry.options, TO_REDACT),
         },
         "data": async_redact_data(coordinator.data, TO_REDACT),
+        "state_writes": coordinator.state_writes,
+        "metrics": {
+            "refresh_duration": coordinator.refresh_duration,
+            "connections": coordinator.connections,
+            "logins_per_hour": coordinator.logins_per_hour(),
+            "endpoints": {
+                section: metrics.as_dict()
+                for section, metrics in coordinator.endpoint_metrics.items()
+            },
+        },
+        "sections": {
+            section: coordinator.section_state(section)
+            for section in coordinator.endpoint_metrics
+        },
+        "scheduler": coordinator.scheduler.as_dict(entry.entry_id),
+        "cache": coordinator.cache_stats,
+        "merge_conflicts": coordinator.merge_conflicts,
+        "breakers": {
+            section: breaker.as_dict()
+            for section, breaker in coordinator.breakers.items()
+        },
+        "requests": _requests,
         "raw": async_redact_data(_datas, TO_REDACT),
     }
@@ -2,8 +2,6 @@
 
 from __future__ import annotations
 
-from typing import Any
-
 from homeassistant.const import CONF_HOST
 from homeassistant.core import callback
 from homeassistant.helpers import device_registry as dr
@@ -12,7 +10,8 @@ from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .const import BBOX_NAME, DOMAIN, MANUFACTURER
 from .coordinator import BboxDataUpdateCoordinator
-from .helpers import finditem
+from .helpers import compile_key_chain, finditem
+from .hosts import NO_HOST, Host
 
 
 class BboxEntity(CoordinatorEntity[BboxDataUpdateCoordinator], Entity):
@@ -24,8 +23,10 @@ class BboxEntity(CoordinatorEntity[BboxDataUpdateCoordinator], Entity):
         self, coordinator: BboxDataUpdateCoordinator, description: EntityDescription
     ) -> None:
         """Initialize the entity."""
-        super().__init__(coordinator)
+        self._section = description.key.split(".")[0]
+        super().__init__(coordinator, self._section)
         self.entity_description = description
+        self._key_getter = compile_key_chain(description.key)
 
         device = finditem(coordinator.data, "info.device")
         self.box_id = device.get("serialnumber", "ABC12345")
@@ -39,6 +40,11 @@ class BboxEntity(CoordinatorEntity[BboxDataUpdateCoordinator], Entity):
             "configuration_url": f"https://{coordinator.config_entry.data[CONF_HOST]}",
         }
 
+    @property
+    def available(self) -> bool:
+        """Return True until the section failed for longer than max staleness."""
+        return super().available and not self.coordinator.section_expired(self._section)
+
 
 class BboxDeviceEntity(BboxEntity):
     """Base class for all device's entities connected to the Bbox."""
@@ -47,25 +53,28 @@ class BboxDeviceEntity(BboxEntity):
         self,
         coordinator: BboxDataUpdateCoordinator,
         description: EntityDescription,
-        device: dict[str, Any],
+        device: Host,
     ) -> None:
         """Initialize."""
         super().__init__(coordinator, description)
         self._device = device
-        self._device_key = f"{self.box_id}_{device['macaddress'].replace(':', '_')}"
-        if self._device.get("userfriendlyname", "") != "":
-            self._device_name = str(device["userfriendlyname"])
-        elif self._device.get("hostname") != "":
-            self._device_name = str(device["hostname"])
+        self._mac = device.macaddress
+        self._section = "devices"
+        self.coordinator_context = ("devices", self._mac)
+        self._device_key = f"{self.box_id}_{self._mac.replace(':', '_')}"
+        if device.userfriendlyname != "":
+            self._device_name = str(device.userfriendlyname)
+        elif device.hostname != "":
+            self._device_name = str(device.hostname)
         else:
-            self._device_name = device["macaddress"]
+            self._device_name = self._mac
 
         self._attr_name = str(self._device_name)
         self._attr_unique_id = f"{self._device_key}_device_tracker"
         self._attr_device_info = {
             "name": str(self._device_name),
             "identifiers": {(DOMAIN, self._device_key)},
-            "connections": {(dr.CONNECTION_NETWORK_MAC, device["macaddress"])},
+            "connections": {(dr.CONNECTION_NETWORK_MAC, self._mac)},
             "via_device": (DOMAIN, self.box_id),
         }
 
@@ -73,22 +82,12 @@ class BboxDeviceEntity(BboxEntity):
     def extra_state_attributes(self):
         """Return extra attributes."""
         return {
-            "link": self._device.get("link"),
-            "last_seen": self._device.get("lastseen"),
+            "link": self._device.link,
+            "last_seen": self._device.lastseen,
         }
 
     @callback
     def _handle_coordinator_update(self) -> None:
         """Respond to a DataUpdateCoordinator update."""
-        devices = (
-            self.coordinator.data.get("devices", {}).get("hosts", {}).get("list", [])
-        )
-        self._device = next(
-            (
-                device
-                for device in devices
-                if device["macaddress"] == self._device.get("macaddress", None)
-            ),
-            {},
-        )
+        self._device = self.coordinator.hosts.get(self._mac, NO_HOST)
         self.async_write_ha_state()
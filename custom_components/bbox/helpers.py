@@ -2,9 +2,32 @@
 
 from __future__ import annotations
 
+from collections.abc import Callable
+from functools import cache
 from typing import Any
 
 
+@cache
+def compile_key_chain(key_chain: str) -> Callable[..., Any]:
+    """Return a getter for a key chain, parsed once.
+
+    The getter takes the data and an optional default and behaves as finditem.
+    """
+    keys = tuple(
+        (key, int(key) if key.isdigit() else None) for key in key_chain.split(".")
+    )
+
+    def getter(data: Any, default: Any = None) -> Any:
+        for key, index in keys:
+            if isinstance(data, dict):
+                data = data.get(key)
+            elif index is not None and isinstance(data, list) and index < len(data):
+                data = data[index]
+        return default if data is None else data
+
+    return getter
+
+
 def finditem(data: dict[str, Any], key_chain: str, default: Any = None) -> Any:
     """Get recursive key and return value.
 
@@ -15,15 +38,4 @@ def finditem(data: dict[str, Any], key_chain: str, default: Any = None) -> Any:
     {"a":{"b":[{"c":"value"}]}
     key = a.b.0.c
     """
-    if (keys := key_chain.split(".")) and isinstance(keys, list):
-        for key in keys:
-            if isinstance(data, dict):
-                data = data.get(key)
-            elif (
-                isinstance(data, list)
-                and len(data) > 0
-                and key.isdigit()
-                and int(key) < len(data)
-            ):
-                data = data[int(key)]
-    return default if data is None and default is not None else data
+    return compile_key_chain(key_chain)(data, default)
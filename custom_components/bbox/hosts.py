@@ -0,0 +1,93 @@
+"""Compact records of the hosts connected to the Bbox."""
+
+from __future__ import annotations
+
+from typing import Any
+
+
+class Host:
+    """Fields of a host used by the entities, the rest of the payload is dropped.
+
+    The Bbox returns per host blocks (ping, wireless, plc, ...) the
+    integration does not use, they are only fetched again by diagnostics.
+    """
+
+    __slots__ = (
+        "active",
+        "hostname",
+        "ipaddress",
+        "lastseen",
+        "link",
+        "macaddress",
+        "parentalcontrol",
+        "userfriendlyname",
+    )
+
+    def __init__(
+        self,
+        macaddress: str | None = None,
+        hostname: str | None = None,
+        userfriendlyname: str = "",
+        ipaddress: str | None = None,
+        link: str | None = None,
+        lastseen: Any = None,
+        active: Any = None,
+        parentalcontrol: Any = None,
+    ) -> None:
+        """Initialize."""
+        self.macaddress = macaddress
+        self.hostname = hostname
+        self.userfriendlyname = userfriendlyname
+        self.ipaddress = ipaddress
+        self.link = link
+        self.lastseen = lastseen
+        self.active = active
+        self.parentalcontrol = parentalcontrol
+
+    @classmethod
+    def from_payload(cls, host: dict[str, Any]) -> Host:
+        """Return the record of a host of the payload."""
+        parentalcontrol = host.get("parentalcontrol")
+        return cls(
+            host.get("macaddress"),
+            host.get("hostname"),
+            host.get("userfriendlyname", ""),
+            host.get("ipaddress"),
+            host.get("link"),
+            host.get("lastseen"),
+            host.get("active"),
+            parentalcontrol.get("enable")
+            if isinstance(parentalcontrol, dict)
+            else None,
+        )
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the host in the shape of the payload."""
+        return {
+            "macaddress": self.macaddress,
+            "hostname": self.hostname,
+            "userfriendlyname": self.userfriendlyname,
+            "ipaddress": self.ipaddress,
+            "link": self.link,
+            "lastseen": self.lastseen,
+            "active": self.active,
+            "parentalcontrol": {"enable": self.parentalcontrol},
+        }
+
+    def __eq__(self, other: object) -> bool:
+        """Return True if all fields are equal."""
+        if not isinstance(other, Host):
+            return NotImplemented
+        return all(
+            getattr(self, field) == getattr(other, field) for field in self.__slots__
+        )
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        """Return the representation of the host."""
+        return f"Host({self.as_dict()})"
+
+
+# Record of a host which left the Bbox
+NO_HOST = Host()
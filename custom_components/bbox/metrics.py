@@ -0,0 +1,54 @@
+"""Request metrics of the Bbox API."""
+
+from __future__ import annotations
+
+from collections import deque
+from collections.abc import Iterator
+from contextlib import contextmanager
+from math import ceil
+from time import monotonic
+from typing import Any
+
+# Latencies kept to compute percentiles
+LATENCY_SAMPLES = 100
+
+
+class EndpointMetrics:
+    """Latency and error count of an endpoint."""
+
+    def __init__(self, size: int = LATENCY_SAMPLES) -> None:
+        """Initialize."""
+        self.latencies: deque[float] = deque(maxlen=size)
+        self.requests = 0
+        self.errors = 0
+
+    @contextmanager
+    def measure(self) -> Iterator[None]:
+        """Record the latency of a request, and the error it may raise."""
+        start = monotonic()
+        self.requests += 1
+        try:
+            yield
+        except Exception:
+            self.errors += 1
+            raise
+        finally:
+            self.latencies.append(monotonic() - start)
+
+    def percentile(self, percent: float) -> float | None:
+        """Return the latency percentile (nearest rank) in milliseconds."""
+        if not self.latencies:
+            return None
+        latencies = sorted(self.latencies)
+        rank = max(ceil(percent / 100 * len(latencies)), 1)
+        return round(latencies[rank - 1] * 1000, 1)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return a summary of the metrics."""
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "p50": self.percentile(50),
+            "p95": self.percentile(95),
+            "max": self.percentile(100),
+        }
@@ -0,0 +1,121 @@
+"""Recording of the responses of the Bbox API, redacted, to replay them."""
+
+from __future__ import annotations
+
+import gzip
+import hashlib
+import json
+import secrets
+import threading
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Any
+
+from .const import TO_REDACT
+
+RECORDING_VERSION = 1
+# Size (in bytes) from which the recording is moved to <path>.1
+RECORDING_MAX_SIZE = 20 * 1024 * 1024
+
+
+class TrafficRecorder:
+    """Write the sections fetched by each refresh to a gzipped JSON lines file.
+
+    The first line holds the version and the salt of the recording. Values
+    of the keys in TO_REDACT are replaced by pseudonyms, the same value
+    always gets the same pseudonym within a recording so that hosts stay
+    distinct. The salt of an existing recording is reused, so pseudonyms
+    do not change when appending after a restart.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        salt: bytes | None = None,
+        max_size: int = RECORDING_MAX_SIZE,
+    ) -> None:
+        """Initialize."""
+        self.path = path
+        self.max_size = max_size
+        self._salt = salt
+        self._sections: dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def add(self, section: str, payload: Any) -> None:
+        """Record the response of a section, redacted when written."""
+        self._sections[section] = json.dumps(payload)
+
+    def take(self) -> dict[str, str]:
+        """Return the sections recorded since the last call."""
+        sections, self._sections = self._sections, {}
+        return sections
+
+    def write(self, sections: dict[str, str]) -> None:
+        """Append a refresh to the recording, rotated once over max_size."""
+        if not sections:
+            return
+        with self._lock:
+            if self._salt is None:
+                if (salt := self._read_salt()) is None and self.path.exists():
+                    # Not a recording this version can append to
+                    self._rotate()
+                self._salt = salt or secrets.token_bytes(16)
+            elif self.path.exists() and self.path.stat().st_size >= self.max_size:
+                self._rotate()
+            redacted = {
+                section: self.redact(json.loads(payload))
+                for section, payload in sections.items()
+            }
+            new = not self.path.exists()
+            with gzip.open(self.path, "at", encoding="utf-8") as file:
+                if new:
+                    header = {"version": RECORDING_VERSION, "salt": self._salt.hex()}
+                    file.write(json.dumps(header) + "\n")
+                file.write(json.dumps({"sections": redacted}) + "\n")
+
+    def _read_salt(self) -> bytes | None:
+        """Return the salt of the existing recording, None if there is none."""
+        try:
+            with gzip.open(self.path, "rt", encoding="utf-8") as file:
+                header = json.loads(next(file))
+            if header["version"] != RECORDING_VERSION:
+                return None
+            return bytes.fromhex(header["salt"])
+        except (OSError, StopIteration, KeyError, TypeError, ValueError):
+            return None
+
+    def _rotate(self) -> None:
+        """Move the recording to <path>.1, replacing the previous one."""
+        self.path.replace(self.path.with_name(f"{self.path.name}.1"))
+
+    def redact(self, obj: Any) -> Any:
+        """Return a copy of obj with the values of sensitive keys replaced."""
+        if isinstance(obj, dict):
+            return {
+                key: self._pseudonym(value)
+                if key in TO_REDACT and not isinstance(value, dict | list)
+                else self.redact(value)
+                for key, value in obj.items()
+            }
+        if isinstance(obj, list):
+            return [self.redact(value) for value in obj]
+        return obj
+
+    def _pseudonym(self, value: Any) -> Any:
+        """Return a pseudonym of a value, empty values are kept."""
+        if value in (None, ""):
+            return value
+        if self._salt is None:
+            self._salt = secrets.token_bytes(16)
+        digest = hashlib.sha256(self._salt + str(value).encode()).hexdigest()
+        return f"redacted-{digest[:12]}"
+
+
+def read_recording(path: Path) -> Iterator[dict[str, Any]]:
+    """Yield the sections fetched by each refresh of a recording."""
+    with gzip.open(path, "rt", encoding="utf-8") as file:
+        header = json.loads(next(file))
+        if header.get("version") != RECORDING_VERSION:
+            raise ValueError(f"Unsupported recording version: {header}")
+        for line in file:
+            yield json.loads(line)["sections"]
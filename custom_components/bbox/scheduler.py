@@ -0,0 +1,92 @@
+"""Poll scheduler spreading the refreshes of all the Bbox entries."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from math import floor
+from random import uniform
+from typing import Any
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.util.hass_dict import HassKey
+
+from .const import DOMAIN
+
+# Scheduled refreshes running at the same time, all entries together
+MAX_CONCURRENT_REFRESHES = 2
+# Longest random delay (in seconds) added to a scheduled refresh
+REFRESH_JITTER = 0.5
+
+DATA_SCHEDULER: HassKey[PollScheduler] = HassKey(f"{DOMAIN}_scheduler")
+
+
+class PollScheduler:
+    """Give each entry its own phase in the poll cycle, bound refreshes running.
+
+    With n entries, the entry k refreshes k/n of its interval after the
+    first one, on a grid starting when the first entry was registered.
+    """
+
+    def __init__(
+        self,
+        epoch: float,
+        limit: int = MAX_CONCURRENT_REFRESHES,
+        jitter: float = REFRESH_JITTER,
+    ) -> None:
+        """Initialize."""
+        self.epoch = epoch
+        self.jitter = jitter
+        self.waits = 0
+        self._entries: list[str] = []
+        self._semaphore = asyncio.Semaphore(limit)
+
+    @callback
+    def register(self, entry_id: str) -> CALLBACK_TYPE:
+        """Add an entry to the poll cycle, return a callback removing it."""
+        self._entries.append(entry_id)
+
+        @callback
+        def unregister() -> None:
+            self._entries.remove(entry_id)
+
+        return unregister
+
+    def phase(self, entry_id: str) -> float:
+        """Return the share of the interval the entry is shifted by."""
+        return self._entries.index(entry_id) / len(self._entries)
+
+    def next_refresh(self, entry_id: str, now: float, interval: float) -> float:
+        """Return the time of the next refresh of the entry.
+
+        It is the first time of its phase at least half an interval after now,
+        refreshes of an entry are then an interval apart.
+        """
+        offset = self.epoch + self.phase(entry_id) * interval
+        cycles = floor((now + interval / 2 - offset) / interval) + 1
+        return offset + cycles * interval + uniform(0, min(self.jitter, interval / 4))
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        """Wait until fewer than the limit of refreshes are running."""
+        if self._semaphore.locked():
+            self.waits += 1
+        async with self._semaphore:
+            yield
+
+    def as_dict(self, entry_id: str) -> dict[str, Any]:
+        """Return the state of the scheduler for an entry."""
+        return {
+            "entries": len(self._entries),
+            "phase": round(self.phase(entry_id), 3),
+            "waits": self.waits,
+        }
+
+
+@callback
+def async_get_scheduler(hass: HomeAssistant) -> PollScheduler:
+    """Return the poll scheduler shared by all the entries."""
+    if (scheduler := hass.data.get(DATA_SCHEDULER)) is None:
+        scheduler = hass.data[DATA_SCHEDULER] = PollScheduler(hass.loop.time())
+    return scheduler
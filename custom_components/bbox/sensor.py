@@ -14,6 +14,7 @@ from homeassistant.components.sensor import (
 )
 from homeassistant.const import (
     PERCENTAGE,
+    EntityCategory,
     UnitOfDataRate,
     UnitOfInformation,
     UnitOfTemperature,
@@ -24,8 +25,10 @@ from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.typing import StateType
 
 from . import BBoxConfigEntry
+from .coordinator import ENDPOINTS, BboxDataUpdateCoordinator
 from .entity import BboxEntity
-from .helpers import finditem
+from .helpers import compile_key_chain
+from .metrics import EndpointMetrics
 
 
 @dataclass(frozen=True)
@@ -34,6 +37,25 @@ class BboxSensorDescription(SensorEntityDescription):
 
     get_value: Callable[..., Any] | None = None
     value_fn: Callable[..., StateType] | None = None
+    attributes_fn: Callable[..., dict[str, Any]] | None = None
+    derived: str | None = None
+
+
+def _throughput_sensor(direction: str, name: str, icon: str) -> BboxSensorDescription:
+    """Describe the throughput sensor computed from WAN byte counters."""
+    stats = f"{direction}_throughput_stats"
+    return BboxSensorDescription(
+        key=f"wan_ip_stats.wan.ip.stats.{direction}.throughput",
+        name=f"{name} throughput",
+        device_class=SensorDeviceClass.DATA_RATE,
+        icon=icon,
+        derived=f"{direction}_throughput",
+        attributes_fn=lambda self: (
+            self.coordinator.data.get("derived", {}).get(stats)
+        ),
+        native_unit_of_measurement=UnitOfDataRate.KILOBITS_PER_SECOND,
+        state_class=SensorStateClass.MEASUREMENT,
+    )
 
 
 SENSOR_TYPES: tuple[BboxSensorDescription, ...] = (
@@ -51,7 +73,7 @@ SENSOR_TYPES: tuple[BboxSensorDescription, ...] = (
         device_class=SensorDeviceClass.DATA_SIZE,
         native_unit_of_measurement=UnitOfInformation.KILOBITS,
         icon="mdi:download-network",
-        value_fn=lambda x: round(float(x) / 1000, 2),
+        derived="rx_kilobits",
         state_class=SensorStateClass.MEASUREMENT,
     ),
     BboxSensorDescription(
@@ -78,19 +100,7 @@ SENSOR_TYPES: tuple[BboxSensorDescription, ...] = (
         name="Download bandwidth occupation",
         device_class=SensorDeviceClass.POWER_FACTOR,
         icon="mdi:upload-network",
-        get_value=lambda self: (
-            float(
-                finditem(
-                    self.coordinator.data, "wan_ip_stats.wan.ip.stats.rx.bandwidth"
-                )
-            )
-            * 100
-            / float(
-                finditem(
-                    self.coordinator.data, "wan_ip_stats.wan.ip.stats.rx.maxBandwidth"
-                )
-            )
-        ),
+        derived="rx_occupation",
         native_unit_of_measurement=PERCENTAGE,
         state_class=SensorStateClass.MEASUREMENT,
     ),
@@ -100,7 +110,7 @@ SENSOR_TYPES: tuple[BboxSensorDescription, ...] = (
         device_class=SensorDeviceClass.DATA_SIZE,
         native_unit_of_measurement=UnitOfInformation.KILOBITS,
         icon="mdi:upload-network",
-        value_fn=lambda x: round(float(x) / 1000, 2),
+        derived="tx_kilobits",
         state_class=SensorStateClass.MEASUREMENT,
     ),
     BboxSensorDescription(
@@ -127,22 +137,12 @@ SENSOR_TYPES: tuple[BboxSensorDescription, ...] = (
         name="Upload bandwidth occupation",
         device_class=SensorDeviceClass.POWER_FACTOR,
         icon="mdi:upload-network",
-        get_value=lambda self: (
-            float(
-                finditem(
-                    self.coordinator.data, "wan_ip_stats.wan.ip.stats.tx.bandwidth"
-                )
-            )
-            * 100
-            / float(
-                finditem(
-                    self.coordinator.data, "wan_ip_stats.wan.ip.stats.tx.maxBandwidth"
-                )
-            )
-        ),
+        derived="tx_occupation",
         native_unit_of_measurement=PERCENTAGE,
         state_class=SensorStateClass.MEASUREMENT,
     ),
+    _throughput_sensor("rx", "Download", "mdi:download-network"),
+    _throughput_sensor("tx", "Upload", "mdi:upload-network"),
     BboxSensorDescription(
         key="wan_ip.wan.ip.address",
         name="IP Address",
@@ -170,10 +170,7 @@ SENSOR_TYPES: tuple[BboxSensorDescription, ...] = (
         name="Memory free",
         device_class=SensorDeviceClass.POWER_FACTOR,
         icon="mdi:gauge",
-        get_value=lambda self: (
-            int(finditem(self.coordinator.data, "memory.device.mem.free") * 100)
-            / int(finditem(self.coordinator.data, "memory.device.mem.total"))
-        ),
+        derived="memory_free",
         native_unit_of_measurement=PERCENTAGE,
         state_class=SensorStateClass.MEASUREMENT,
     ),
@@ -187,6 +184,66 @@ SENSOR_TYPES: tuple[BboxSensorDescription, ...] = (
         state_class=SensorStateClass.MEASUREMENT,
         entity_registry_enabled_default=False
     ),
+    BboxSensorDescription(
+        key="refresh_interval",
+        name="Refresh interval",
+        icon="mdi:update",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.SECONDS,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        get_value=lambda self: self.coordinator.tier_intervals["medium"],
+    ),
+)
+
+
+def _latency_sensor(section: str) -> BboxSensorDescription:
+    """Describe the latency sensor of an endpoint."""
+
+    def metrics(self: BboxSensor) -> EndpointMetrics:
+        return self.coordinator.endpoint_metrics[section]
+
+    return BboxSensorDescription(
+        key=f"metrics.{section}.latency",
+        name=f"Latency {section.replace('_', ' ')}",
+        icon="mdi:timer-outline",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        get_value=lambda self: metrics(self).percentile(95),
+        attributes_fn=lambda self: metrics(self).as_dict(),
+    )
+
+
+METRICS_SENSORS: tuple[BboxSensorDescription, ...] = (
+    BboxSensorDescription(
+        key="metrics.refresh_duration",
+        name="Refresh duration",
+        icon="mdi:timer-outline",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        get_value=lambda self: self.coordinator.refresh_duration,
+    ),
+    *(_latency_sensor(section) for section in ENDPOINTS),
+    BboxSensorDescription(
+        key="metrics.errors",
+        name="Request errors",
+        icon="mdi:alert-circle-outline",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        get_value=lambda self: sum(
+            metrics.errors for metrics in self.coordinator.endpoint_metrics.values()
+        ),
+        attributes_fn=lambda self: {
+            section: metrics.errors
+            for section, metrics in self.coordinator.endpoint_metrics.items()
+        },
+    ),
 )
 
 
@@ -196,22 +253,53 @@ async def async_setup_entry(
     """Set up sensor."""
     coordinator = entry.runtime_data
     entities = [BboxSensor(coordinator, description) for description in SENSOR_TYPES]
+    entities.extend(
+        BboxMetricsSensor(coordinator, description) for description in METRICS_SENSORS
+    )
     async_add_entities(entities)
 
 
 class BboxSensor(BboxEntity, SensorEntity):
     """Representation of a sensor."""
 
+    entity_description: BboxSensorDescription
+
+    def __init__(
+        self, coordinator: BboxDataUpdateCoordinator, description: BboxSensorDescription
+    ) -> None:
+        """Initialize the sensor, derived values are computed by the coordinator."""
+        super().__init__(coordinator, description)
+        if description.derived is not None:
+            self._key_getter = compile_key_chain(f"derived.{description.derived}")
+
     @property
     def native_value(self):
         """Return sensor state."""
         raw_value = (
             self.entity_description.get_value(self)
             if self.entity_description.get_value is not None
-            else finditem(self.coordinator.data, self.entity_description.key)
+            else self._key_getter(self.coordinator.data)
         )
         return (
             self.entity_description.value_fn(raw_value)
             if self.entity_description.value_fn is not None
             else raw_value
         )
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any] | None:
+        """Return extra attributes."""
+        if self.entity_description.attributes_fn is None:
+            return None
+        return self.entity_description.attributes_fn(self)
+
+
+class BboxMetricsSensor(BboxSensor):
+    """Representation of a sensor of the requests made to the Bbox."""
+
+    def __init__(
+        self, coordinator: BboxDataUpdateCoordinator, description: BboxSensorDescription
+    ) -> None:
+        """Initialize the sensor, updated after each refresh."""
+        super().__init__(coordinator, description)
+        self.coordinator_context = None
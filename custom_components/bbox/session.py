@@ -0,0 +1,169 @@
+"""HTTP sessions of the Bbox clients."""
+
+from __future__ import annotations
+
+from collections import defaultdict, deque
+from time import monotonic
+from types import SimpleNamespace
+from typing import Any
+
+from aiohttp import (
+    ClientSession,
+    CookieJar,
+    TraceConfig,
+    TraceConnectionCreateEndParams,
+    TraceConnectionReuseconnParams,
+    TraceRequestStartParams,
+)
+from homeassistant.const import EVENT_HOMEASSISTANT_CLOSE
+from homeassistant.core import Event, HomeAssistant, callback
+from homeassistant.helpers.aiohttp_client import async_create_clientsession
+from homeassistant.util.hass_dict import HassKey
+from yarl import URL
+
+from .const import DOMAIN
+
+# Logins are reported over this period (in seconds)
+LOGIN_PERIOD = 3600
+
+DATA_CONNECTIONS: HassKey[dict[str, dict[str, int]]] = HassKey(f"{DOMAIN}_connections")
+DATA_CLIENTS: HassKey[dict[str, ClientSlot]] = HassKey(f"{DOMAIN}_clients")
+
+
+class ClientSlot:
+    """Bbox client of an entry, kept logged in across reloads."""
+
+    def __init__(self) -> None:
+        """Initialize."""
+        self.credentials: tuple[Any, ...] | None = None
+        self.client: Any = None
+        self.generation = 0
+        self.authenticated = False
+        self.logins: deque[float] = deque()
+        self.session: ClientSession | None = None
+        self.verify_ssl: bool | None = None
+
+    def replace(self, credentials: tuple[Any, ...], client: Any) -> None:
+        """Use a new client, it has to log in."""
+        self.credentials = credentials
+        self.client = client
+        self.generation += 1
+        self.authenticated = False
+
+    def detach(self) -> None:
+        """Release the session, the connections are those of HA."""
+        if self.session is not None:
+            self.session.detach()
+            self.session = None
+
+    def record_login(self) -> None:
+        """Record a login of the client."""
+        self.authenticated = True
+        self.logins.append(monotonic())
+
+    def logins_per_hour(self) -> int:
+        """Return the number of logins during the last hour."""
+        since = monotonic() - LOGIN_PERIOD
+        while self.logins and self.logins[0] < since:
+            self.logins.popleft()
+        return len(self.logins)
+
+
+def _connection_trace(hass: HomeAssistant) -> TraceConfig:
+    """Return the trace counting new and reused connections per host."""
+    stats = hass.data.setdefault(
+        DATA_CONNECTIONS, defaultdict(lambda: {"created": 0, "reused": 0})
+    )
+
+    async def on_request_start(
+        _session: ClientSession,
+        context: SimpleNamespace,
+        params: TraceRequestStartParams,
+    ) -> None:
+        context.host = params.url.host
+
+    async def on_connection_create_end(
+        _session: ClientSession,
+        context: SimpleNamespace,
+        _params: TraceConnectionCreateEndParams,
+    ) -> None:
+        stats[context.host]["created"] += 1
+
+    async def on_connection_reuseconn(
+        _session: ClientSession,
+        context: SimpleNamespace,
+        _params: TraceConnectionReuseconnParams,
+    ) -> None:
+        stats[context.host]["reused"] += 1
+
+    trace = TraceConfig()
+    trace.on_request_start.append(on_request_start)
+    trace.on_connection_create_end.append(on_connection_create_end)
+    trace.on_connection_reuseconn.append(on_connection_reuseconn)
+    return trace
+
+
+@callback
+def async_create_session(
+    hass: HomeAssistant, verify_ssl: bool, auto_cleanup: bool = True
+) -> ClientSession:
+    """Return a session with its own cookie jar over the connections of HA.
+
+    The Bbox may be reached by its IP address, its cookies are accepted
+    anyway. New and reused connections are counted per host.
+    """
+    return async_create_clientsession(
+        hass,
+        verify_ssl,
+        auto_cleanup=auto_cleanup,
+        cookie_jar=CookieJar(unsafe=True),
+        trace_configs=[_connection_trace(hass)],
+    )
+
+
+@callback
+def async_get_session(
+    hass: HomeAssistant, entry_id: str, verify_ssl: bool
+) -> ClientSession:
+    """Return the session of an entry, which outlives its reloads.
+
+    A login of a flow, on its own session, does not replace the cookie of
+    the entry. The connections to the Bbox are bounded by the requests limit
+    of the entry, plus one for its writes.
+    """
+    slot = async_get_client_slot(hass, entry_id)
+    if slot.session is None or slot.verify_ssl != verify_ssl:
+        if slot.session is not None:
+            slot.session.detach()
+        slot.session = async_create_session(hass, verify_ssl, auto_cleanup=False)
+        slot.verify_ssl = verify_ssl
+    return slot.session
+
+
+@callback
+def async_get_connection_stats(hass: HomeAssistant, host: str) -> dict[str, Any]:
+    """Return the connections created and reused to reach host, whatever its port."""
+    stats = hass.data.get(DATA_CONNECTIONS, {}).get(URL(f"//{host}").host)
+    return dict(stats) if stats else {"created": 0, "reused": 0}
+
+
+@callback
+def async_get_client_slot(hass: HomeAssistant, entry_id: str) -> ClientSlot:
+    """Return the client slot of an entry, which outlives its reloads."""
+    if (slots := hass.data.get(DATA_CLIENTS)) is None:
+        slots = hass.data[DATA_CLIENTS] = {}
+
+        @callback
+        def async_detach(_event: Event) -> None:
+            for slot in slots.values():
+                slot.detach()
+
+        hass.bus.async_listen_once(EVENT_HOMEASSISTANT_CLOSE, async_detach)
+    return slots.setdefault(entry_id, ClientSlot())
+
+
+@callback
+def async_remove_client_slot(hass: HomeAssistant, entry_id: str) -> None:
+    """Forget the client and the session of a removed entry."""
+    if (slot := hass.data.get(DATA_CLIENTS, {}).pop(entry_id, None)) is not None:
+        slot.detach()
@@ -1,6 +1,5 @@
 """Button for Bbox router."""
 
-import asyncio
 from dataclasses import dataclass
 import logging
 from typing import Any, Final
@@ -8,12 +7,13 @@ from typing import Any, Final
 from bboxpy.exceptions import BboxException
 
 from homeassistant.components.switch import SwitchEntity, SwitchEntityDescription
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
 from . import BBoxConfigEntry, BboxDataUpdateCoordinator
 from .entity import BboxDeviceEntity, BboxEntity
-from .helpers import finditem
+from .helpers import compile_key_chain
+from .hosts import Host
 
 
 @dataclass(frozen=True)
@@ -104,21 +104,23 @@ async def async_setup_entry(
     """Set up sensor."""
     coordinator = entry.runtime_data
 
-    devices = coordinator.data.get("devices", {}).get("hosts", {}).get("list", [])
-    entities = [
-        DeviceParentalControlSwitch(coordinator, SWITCHE_DEVICES, device)
-        for device in devices
-        if device.get("macaddress")
-    ]
-    entities += [BboxSwitch(coordinator, description) for description in SWITCH_TYPES]
-    async_add_entities(entities)
+    @callback
+    def async_add_hosts(devices: list[Host]) -> None:
+        """Add parental control switches of new hosts."""
+        async_add_entities(
+            DeviceParentalControlSwitch(coordinator, SWITCHE_DEVICES, device)
+            for device in devices
+        )
+
+    entry.async_on_unload(coordinator.async_add_hosts_listener(async_add_hosts))
+    async_add_entities(
+        BboxSwitch(coordinator, description) for description in SWITCH_TYPES
+    )
 
 
 class BboxSwitch(BboxEntity, SwitchEntity):
     """Representation of a switch for Bbox."""
 
-    waiting_delay_after_toggle = 5
-
     def __init__(
         self,
         coordinator: BboxDataUpdateCoordinator,
@@ -126,39 +128,42 @@ class BboxSwitch(BboxEntity, SwitchEntity):
     ) -> None:
         """Initialize."""
         super().__init__(coordinator, description)
+        self._section = description.state.split(".")[0]
+        self.coordinator_context = self._section
+        self._key_getter = compile_key_chain(description.state)
 
     @property
     def is_on(self) -> bool:
         """Return state."""
-        return bool(finditem(self.coordinator.data, self.entity_description.state))
+        return bool(self._key_getter(self.coordinator.data))
 
     async def async_turn_on(self, **kwargs: Any) -> None:
         """Turn the switch on."""
         kwargs = kwargs or {"enable": True}
         try:
-            await getattr(
-                getattr(self.coordinator.bbox, self.entity_description.api),
+            await self.coordinator.async_write(
+                self.entity_description.api,
                 self.entity_description.turn_on,
-            )(**kwargs)
+                self._section,
+                lambda: self.is_on is kwargs["enable"],
+                **kwargs,
+            )
         except BboxException as error:
             _LOGGER.error(error)
-        else:
-            await asyncio.sleep(self.waiting_delay_after_toggle)
-            await self.coordinator.async_request_refresh()
 
     async def async_turn_off(self, **kwargs: Any) -> None:
         """Turn the switch off."""
         kwargs = kwargs or {"enable": False}
         try:
-            await getattr(
-                getattr(self.coordinator.bbox, self.entity_description.api),
+            await self.coordinator.async_write(
+                self.entity_description.api,
                 self.entity_description.turn_off,
-            )(**kwargs)
+                self._section,
+                lambda: self.is_on is kwargs["enable"],
+                **kwargs,
+            )
         except BboxException as error:
             _LOGGER.error(error)
-        else:
-            await asyncio.sleep(self.waiting_delay_after_toggle)
-            await self.coordinator.async_request_refresh()
 
 
 class DeviceParentalControlSwitch(BboxDeviceEntity, BboxSwitch):
@@ -168,24 +173,23 @@ class DeviceParentalControlSwitch(BboxDeviceEntity, BboxSwitch):
         self,
         coordinator: BboxDataUpdateCoordinator,
         description: BboxSwitchEntityDescription,
-        device: dict[str, Any],
+        device: Host,
     ) -> None:
         """Initialize."""
         super().__init__(coordinator, description, device)
 
         self._attr_unique_id = f"{self._device_key}_parental_control"
+        self._section = "devices"
 
     @property
     def is_on(self) -> bool:
         """Return true if device parental control is currently enabled."""
-        return bool(finditem(self._device, self.entity_description.state))
+        return bool(self._device.parentalcontrol)
 
     async def async_turn_on(self, **kwargs: Any) -> None:
         """Turn the switch on."""
-        await super().async_turn_on(macaddress=self._device["macaddress"], enable=True)
+        await super().async_turn_on(macaddress=self._mac, enable=True)
 
     async def async_turn_off(self, **kwargs: Any) -> None:
         """Turn the switch off."""
-        await super().async_turn_off(
-            macaddress=self._device["macaddress"], enable=False
-        )
+        await super().async_turn_off(macaddress=self._mac, enable=False)
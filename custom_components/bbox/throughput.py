@@ -0,0 +1,152 @@
+"""WAN throughput computed from the byte counters of the Bbox."""
+
+from __future__ import annotations
+
+from array import array
+from collections.abc import Iterator
+from itertools import pairwise
+from math import ceil
+from typing import Any
+
+# Windows (in seconds) of the rolling averages
+THROUGHPUT_WINDOWS = {"avg_1m": 60, "avg_5m": 300, "avg_15m": 900}
+# Shortest time (in seconds) between samples, the fastest refresh rate allowed
+MIN_SAMPLE_INTERVAL = 1
+# A counter going backwards from above this share of its range wrapped around
+WRAP_THRESHOLD = 0.75
+
+DIRECTIONS = ("rx", "tx")
+
+
+def samples_for(interval: float) -> int:
+    """Return the samples covering the longest window, one every interval."""
+    longest = max(THROUGHPUT_WINDOWS.values())
+    return ceil(longest / max(interval, MIN_SAMPLE_INTERVAL)) + 1
+
+
+class ThroughputBuffer:
+    """Ring buffer of (time, rx bytes, tx bytes) samples.
+
+    Counters are stored as totals corrected for resets and wraparounds, so
+    the bytes transferred between two samples is their difference.
+    """
+
+    def __init__(self, capacity: int = samples_for(MIN_SAMPLE_INTERVAL)) -> None:
+        """Initialize."""
+        self.capacity = capacity
+        self._times = array("d", bytes(8 * capacity))
+        self._totals = {
+            direction: array("d", bytes(8 * capacity)) for direction in DIRECTIONS
+        }
+        self._next = 0
+        self._count = 0
+        self._raw: dict[str, float] = {}
+        self._offsets = dict.fromkeys(DIRECTIONS, 0.0)
+        self._boots: Any = None
+        # Counters which restarted since the last change of boots
+        self._dropped = dict.fromkeys(DIRECTIONS, False)
+
+    def __len__(self) -> int:
+        """Return the number of samples."""
+        return self._count
+
+    def add(self, time: float, rx: float, tx: float, boots: Any = None) -> None:
+        """Add a sample, boots changes when the Bbox restarted its counters.
+
+        The change of boots may come after the counters restarted, as info is
+        refreshed less often, a restart is then only counted once.
+        """
+        reset = None not in (boots, self._boots) and boots != self._boots
+        if boots is not None:
+            self._boots = boots
+        for direction, raw in zip(DIRECTIONS, (rx, tx), strict=True):
+            if (last := self._raw.get(direction)) is not None:
+                modulus = 2**32 if last < 2**32 else 2**64
+                dropped = raw < last < modulus * WRAP_THRESHOLD
+                if dropped or (reset and not self._dropped[direction]):
+                    # Counter restarted from 0
+                    self._offsets[direction] += last
+                elif raw < last:
+                    self._offsets[direction] += modulus
+                self._dropped[direction] = dropped or (
+                    self._dropped[direction] and not reset
+                )
+            self._raw[direction] = raw
+            self._totals[direction][self._next] = raw + self._offsets[direction]
+        self._times[self._next] = time
+        self._next = (self._next + 1) % self.capacity
+        self._count = min(self._count + 1, self.capacity)
+
+    def resize(self, capacity: int) -> None:
+        """Change the number of samples kept, the most recent ones are kept."""
+        if capacity == self.capacity:
+            return
+        indexes = list(self._indexes())[-capacity:]
+        self._times = array("d", (self._times[idx] for idx in indexes))
+        self._times.extend(bytes(8 * (capacity - len(indexes))))
+        for direction, totals in self._totals.items():
+            kept = array("d", (totals[idx] for idx in indexes))
+            kept.extend(bytes(8 * (capacity - len(indexes))))
+            self._totals[direction] = kept
+        self.capacity = capacity
+        self._count = len(indexes)
+        self._next = self._count % capacity
+
+    def _indexes(self, window: float | None = None) -> Iterator[int]:
+        """Yield indexes of samples, oldest first, within window of the last."""
+        first = self._next - self._count
+        since = None
+        if window is not None and self._count:
+            since = self._times[(self._next - 1) % self.capacity] - window
+        for idx in range(first, self._next):
+            idx %= self.capacity
+            if since is None or self._times[idx] >= since:
+                yield idx
+
+    def average(self, direction: str, window: float) -> float | None:
+        """Return the throughput (in kbit/s) over window seconds."""
+        indexes = list(self._indexes(window))
+        if len(indexes) < 2:
+            return None
+        return self._rate(direction, indexes[0], indexes[-1])
+
+    def current(self, direction: str) -> float | None:
+        """Return the throughput (in kbit/s) between the last two samples."""
+        if self._count < 2:
+            return None
+        last = (self._next - 1) % self.capacity
+        return self._rate(direction, (last - 1) % self.capacity, last)
+
+    def percentile(self, direction: str, percent: float, window: float) -> float | None:
+        """Return the percentile (nearest rank) of throughputs between samples."""
+        indexes = list(self._indexes(window))
+        rates = sorted(
+            rate
+            for start, end in pairwise(indexes)
+            if (rate := self._rate(direction, start, end)) is not None
+        )
+        if not rates:
+            return None
+        return rates[max(ceil(percent / 100 * len(rates)), 1) - 1]
+
+    def _rate(self, direction: str, start: int, end: int) -> float | None:
+        """Return the throughput (in kbit/s) between two samples."""
+        if (elapsed := self._times[end] - self._times[start]) <= 0:
+            return None
+        totals = self._totals[direction]
+        return round((totals[end] - totals[start]) * 8 / 1000 / elapsed, 2)
+
+    def values(self) -> dict[str, Any]:
+        """Return the current throughputs and their statistics."""
+        longest = max(THROUGHPUT_WINDOWS.values())
+        values: dict[str, Any] = {}
+        for direction in DIRECTIONS:
+            values[f"{direction}_throughput"] = self.current(direction)
+            values[f"{direction}_throughput_stats"] = {
+                **{
+                    name: self.average(direction, window)
+                    for name, window in THROUGHPUT_WINDOWS.items()
+                },
+                "p95_15m": self.percentile(direction, 95, longest),
+            }
+        return values
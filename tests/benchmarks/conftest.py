@@ -0,0 +1,70 @@
+"""Fixtures for the bbox benchmarks."""
+
+import inspect
+import json
+import statistics
+from collections.abc import Awaitable, Callable, Generator
+from pathlib import Path
+from time import perf_counter
+from typing import Any
+
+import pytest
+
+MANIFEST = Path(__file__).parents[2] / "custom_components" / "bbox" / "manifest.json"
+
+# Number of hosts of the synthetic households
+HOST_COUNTS = (10, 100, 500, 2000)
+# Payloads only merged, without entities, may be larger
+MERGE_HOST_COUNTS = (*HOST_COUNTS, 5000, 10000)
+# Refreshes of the synthetic recordings replayed
+REPLAY_REFRESHES = 20
+
+
+@pytest.fixture(scope="session")
+def benchmark_results(request: pytest.FixtureRequest) -> Generator[dict[str, Any]]:
+    """Collect results and write them to the benchmark output file."""
+    results: dict[str, Any] = {}
+    yield results
+    if results:
+        Path(request.config.getoption("--benchmark-output")).write_text(
+            json.dumps(
+                {
+                    "version": json.loads(MANIFEST.read_text())["version"],
+                    "results": results,
+                },
+                indent=2,
+            ),
+            encoding="utf-8",
+        )
+
+
+@pytest.fixture
+def measure(
+    benchmark_results: dict[str, Any],
+) -> Callable[..., Awaitable[dict[str, float]]]:
+    """Return a helper timing a sync or async callable and recording it."""
+
+    async def _measure(
+        name: str,
+        func: Callable[[], Any],
+        rounds: int = 5,
+        setup: Callable[[], Any] | None = None,
+    ) -> dict[str, float]:
+        timings = []
+        for _ in range(rounds):
+            if setup is not None:
+                setup()
+            start = perf_counter()
+            result = func()
+            if inspect.isawaitable(result):
+                await result
+            timings.append(perf_counter() - start)
+        benchmark_results[name] = {
+            "rounds": rounds,
+            "min": min(timings),
+            "mean": statistics.mean(timings),
+            "max": max(timings),
+        }
+        return benchmark_results[name]
+
+    return _measure
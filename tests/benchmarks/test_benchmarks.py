@@ -0,0 +1,213 @@
+"""Benchmarks of the coordinator and entities with large households."""
+
+import copy
+from collections.abc import Awaitable, Callable
+from pathlib import Path
+from typing import Any
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import Platform
+from homeassistant.core import HomeAssistant
+
+from custom_components.bbox.const import CONFLICT_COLLECT, CONFLICT_RAISE
+from custom_components.bbox.coordinator import BboxDataUpdateCoordinator
+from custom_components.bbox.helpers import compile_key_chain
+from custom_components.bbox.recorder import TrafficRecorder
+
+from ..const import WAN_IP_STATS, generate_devices
+from ..emulator import BboxEmulator
+from ..replay import async_replay
+from ..test_helpers import DATA, legacy_finditem
+from .conftest import HOST_COUNTS, MERGE_HOST_COUNTS, REPLAY_REFRESHES
+
+pytestmark = pytest.mark.benchmark
+
+type Measure = Callable[..., Awaitable[dict[str, float]]]
+
+
+async def test_compiled_key_chain(measure: Measure) -> None:
+    """Compare compiled getters with parsing the key chain on each read."""
+    key_chain = "wan_ip_stats.wan.ip.stats.rx.bandwidth"
+    getter = compile_key_chain(key_chain)
+
+    def legacy() -> None:
+        for _ in range(20000):
+            legacy_finditem(DATA, key_chain)
+
+    def compiled() -> None:
+        for _ in range(20000):
+            getter(DATA)
+
+    legacy_result = await measure("key_chain[legacy]", legacy)
+    compiled_result = await measure("key_chain[compiled]", compiled)
+    assert compiled_result["min"] < legacy_result["min"]
+
+
+@pytest.mark.parametrize("conflict", [CONFLICT_RAISE, CONFLICT_COLLECT])
+@pytest.mark.parametrize("count", MERGE_HOST_COUNTS)
+async def test_merge_objects(count: int, conflict: str, measure: Measure) -> None:
+    """Benchmark merging a payload spread over several objects."""
+    payload = generate_devices(count, chunks=4)
+    objs: list[dict[str, Any]] = []
+
+    def setup() -> None:
+        objs[:] = copy.deepcopy(payload)
+
+    await measure(
+        f"merge_objects[{conflict}-{count}]",
+        lambda: BboxDataUpdateCoordinator.merge_objects(objs, conflict, []),
+        setup=setup,
+    )
+
+
+@pytest.mark.parametrize("count", HOST_COUNTS)
+async def test_update_data(
+    hass: HomeAssistant,
+    config_entry: ConfigEntry,
+    router: AsyncMock,
+    measure: Measure,
+    count: int,
+) -> None:
+    """Benchmark a full fetch of data."""
+    devices = router.return_value.lan.async_get_connected_devices
+    devices.return_value = generate_devices(count)
+    await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    coordinator = config_entry.runtime_data
+    await measure(
+        f"async_update_data[{count}]",
+        coordinator._async_update_data,
+    )
+
+
+@pytest.mark.parametrize("platform", [Platform.DEVICE_TRACKER, Platform.SWITCH])
+@pytest.mark.parametrize("count", HOST_COUNTS)
+async def test_platform_setup(
+    hass: HomeAssistant,
+    config_entry: ConfigEntry,
+    router: AsyncMock,
+    measure: Measure,
+    count: int,
+    platform: Platform,
+) -> None:
+    """Benchmark the creation of the entities of a platform."""
+    devices = router.return_value.lan.async_get_connected_devices
+    devices.return_value = generate_devices(count)
+    with patch("custom_components.bbox.PLATFORMS", []):
+        await hass.config_entries.async_setup(config_entry.entry_id)
+        await hass.async_block_till_done()
+
+    async def setup_platform() -> None:
+        await hass.config_entries.async_forward_entry_setups(config_entry, [platform])
+        await hass.async_block_till_done()
+
+    await measure(f"setup_{platform}[{count}]", setup_platform, rounds=1)
+
+
+@pytest.mark.parametrize("count", HOST_COUNTS)
+async def test_entities_update(
+    hass: HomeAssistant,
+    config_entry: ConfigEntry,
+    router: AsyncMock,
+    measure: Measure,
+    count: int,
+) -> None:
+    """Benchmark the update of every entity after a refresh."""
+    devices = router.return_value.lan.async_get_connected_devices
+    devices.return_value = generate_devices(count)
+    await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    coordinator = config_entry.runtime_data
+    await measure(
+        f"entities_update[{count}]",
+        lambda: coordinator.async_set_updated_data(coordinator.data),
+    )
+
+
+async def test_host_update_cost_is_flat(
+    hass: HomeAssistant,
+    config_entry: ConfigEntry,
+    router: AsyncMock,
+    measure: Measure,
+) -> None:
+    """Test the per host cost of updating entities does not grow with hosts."""
+    devices = router.return_value.lan.async_get_connected_devices
+    devices.return_value = generate_devices(100)
+    await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+    coordinator = config_entry.runtime_data
+
+    per_host = {}
+    for count in (100, 2000):
+        devices.return_value = generate_devices(count)
+        await coordinator.async_refresh()
+        await hass.async_block_till_done()
+        assert len(coordinator.hosts) == count
+        result = await measure(
+            f"host_update[{count}]",
+            lambda: coordinator.async_set_updated_data(coordinator.data),
+        )
+        per_host[count] = result["min"] / count
+
+    assert per_host[2000] < per_host[100] * 5
+
+
+@pytest.mark.parametrize("latency", [0, 0.05])
+@pytest.mark.parametrize("count", HOST_COUNTS)
+async def test_emulated_refresh(
+    hass: HomeAssistant,
+    emulated_entry: ConfigEntry,
+    emulator: BboxEmulator,
+    measure: Measure,
+    count: int,
+    latency: float,
+) -> None:
+    """Benchmark a refresh over HTTP, from requests to entity updates."""
+    emulator.set_hosts(count)
+    await hass.config_entries.async_setup(emulated_entry.entry_id)
+    await hass.async_block_till_done()
+
+    emulator.latency = latency
+    coordinator = emulated_entry.runtime_data
+
+    async def refresh() -> None:
+        await coordinator.async_refresh()
+        await hass.async_block_till_done()
+
+    await measure(f"emulated_refresh[{count}-{latency}]", refresh)
+
+
+@pytest.mark.parametrize("count", HOST_COUNTS)
+async def test_replay(
+    hass: HomeAssistant,
+    config_entry: ConfigEntry,
+    router: AsyncMock,
+    benchmark_results: dict[str, Any],
+    request: pytest.FixtureRequest,
+    tmp_path: Path,
+    count: int,
+) -> None:
+    """Benchmark replaying a recording, given with --recording or synthetic."""
+    if recording := request.config.getoption("--recording"):
+        if count != HOST_COUNTS[0]:
+            pytest.skip("The recording is replayed once")
+        path = Path(recording)
+        name = f"replay[{path.name}]"
+    else:
+        path = tmp_path / "recording.jsonl.gz"
+        name = f"replay[{count}]"
+        recorder = TrafficRecorder(path)
+        for _ in range(REPLAY_REFRESHES):
+            recorder.add("devices", generate_devices(count))
+            recorder.add("wan_ip_stats", WAN_IP_STATS)
+            recorder.write(recorder.take())
+    await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    result = await async_replay(hass, config_entry, router, path)
+    assert not result["failures"]
+    benchmark_results[name] = result
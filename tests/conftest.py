@@ -1,9 +1,10 @@
 """The tests for the bbox component."""
 
-from typing import Generator
+from collections.abc import AsyncGenerator, Generator
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
+from aiohttp.test_utils import TestServer
 from homeassistant.config_entries import SOURCE_USER, ConfigEntry
 from homeassistant.core import HomeAssistant
 from pytest_homeassistant_custom_component.common import MockConfigEntry
@@ -23,6 +24,21 @@ from .const import (
     WIFI,
     WPS,
 )
+from .emulator import BboxEmulator
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    """Add benchmarks options."""
+    parser.addoption(
+        "--benchmark-output",
+        default="benchmark.json",
+        help="File where benchmark results are written",
+    )
+    parser.addoption(
+        "--recording",
+        default=None,
+        help="Recording of the Bbox API replayed by the benchmarks",
+    )
 
 
 @pytest.fixture(autouse=True)
@@ -38,6 +54,7 @@ def mock_router() -> Generator[MagicMock | AsyncMock]:
         instance = mock.return_value
         instance.open = AsyncMock()
         instance.async_login = AsyncMock(return_value=True)
+        instance.async_auth = AsyncMock(return_value=True)
         instance.device.async_get_bbox_info = AsyncMock(return_value=INFO)
         instance.device.async_get_bbox_mem = AsyncMock(return_value=MEM)
         instance.device.async_get_bbox_led = AsyncMock(return_value=LEDS)
@@ -78,3 +95,27 @@ def get_config_entry(hass: HomeAssistant) -> ConfigEntry:
     )
     config_entry.add_to_hass(hass)
     return config_entry
+
+
+@pytest.fixture(name="emulator")
+async def bbox_emulator(socket_enabled: None) -> AsyncGenerator[BboxEmulator]:
+    """Serve an emulated Bbox on 127.0.0.1, its cookies are kept by IP address."""
+    emulator = BboxEmulator(seed=0)
+    async with TestServer(emulator.app(), host="127.0.0.1") as server:
+        emulator.host = f"127.0.0.1:{server.port}"
+        yield emulator
+
+
+@pytest.fixture(name="emulated_entry")
+def get_emulated_entry(hass: HomeAssistant, emulator: BboxEmulator) -> ConfigEntry:
+    """Create and register a config entry of the emulated Bbox."""
+    config_entry = MockConfigEntry(
+        domain=DOMAIN,
+        source=SOURCE_USER,
+        data={**MOCK_USER_INPUT, "host": emulator.host},
+        unique_id="1",
+        options={},
+        entry_id="123456",
+    )
+    config_entry.add_to_hass(hass)
+    return config_entry
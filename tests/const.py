@@ -1,3 +1,6 @@
+import copy
+from typing import Any
+
 from pytest_homeassistant_custom_component.common import load_json_object_fixture
 
 INFO = [load_json_object_fixture("info.json")]
@@ -17,3 +20,28 @@ MOCK_USER_INPUT = {
     "use_tls": False,
     "verify_ssl": False,
 }
+
+
+def generate_devices(count: int, chunks: int = 1) -> list[dict[str, Any]]:
+    """Return a connected devices payload with count synthetic hosts.
+
+    Hosts are spread over chunks objects, as the Bbox API may return them.
+    """
+    template = DEVICES[0]["hosts"]["list"][0]
+    hosts = [
+        {
+            **copy.deepcopy(template),
+            "id": idx,
+            "hostname": f"Host-{idx:04}",
+            "macaddress": f"02:00:00:{idx >> 16 & 0xFF:02x}:{idx >> 8 & 0xFF:02x}:"
+            f"{idx & 0xFF:02x}",
+            "ipaddress": f"10.{idx >> 16 & 0xFF}.{idx >> 8 & 0xFF}.{idx & 0xFF}",
+        }
+        for idx in range(count)
+    ]
+    devices = []
+    for chunk in range(chunks):
+        obj = copy.deepcopy(DEVICES[0])
+        obj["hosts"]["list"] = hosts[chunk::chunks]
+        devices.append(obj)
+    return devices
@@ -0,0 +1,135 @@
+"""Local emulator of the Bbox API, to test the integration over HTTP."""
+
+import asyncio
+import copy
+import json
+import random
+import secrets
+from collections import Counter
+from datetime import datetime, timedelta
+from typing import Any, Final
+
+from aiohttp import web
+
+from .const import (
+    DEVICES,
+    INFO,
+    LEDS,
+    MEM,
+    PARENTALCONTROL,
+    SPEEDTEST_INFOS,
+    WAN_IP,
+    WAN_IP_STATS,
+    WIFI,
+    WPS,
+    generate_devices,
+)
+
+PASSWORD = "mock_password"
+COOKIE = "BBOX_ID"
+
+# Path of the API, after /api/v1/ => payload of the fixtures
+PAYLOADS: Final[dict[str, list[dict[str, Any]]]] = {
+    "device": INFO,
+    "device/mem": MEM,
+    "device/led": LEDS,
+    "device/summary": [{"device": {"serialnumber": INFO[0]["device"]["serialnumber"]}}],
+    "hosts": DEVICES,
+    "wan/ip/stats": WAN_IP_STATS,
+    "parentalcontrol": PARENTALCONTROL,
+    "wireless/wps": WPS,
+    "wireless": WIFI,
+    "wan/ip": WAN_IP,
+    "speedtest/info": SPEEDTEST_INFOS,
+}
+
+
+class BboxEmulator:
+    """aiohttp application answering as a Bbox.
+
+    host is set to where the emulator is served. Attributes may be changed
+    while the server runs: latency (in seconds) of each response, error_rate
+    of requests answered with an error 500, failing paths always answered
+    with an error, padding (in bytes) added to the payloads. Paths without a
+    payload return an empty object.
+    """
+
+    def __init__(self, hosts: int | None = None, seed: int | None = None) -> None:
+        """Initialize."""
+        self.payloads = copy.deepcopy(PAYLOADS)
+        if hosts is not None:
+            self.set_hosts(hosts)
+        self.latency = 0.0
+        self.error_rate = 0.0
+        self.failing: set[str] = set()
+        self.padding = 0
+        self.requests: Counter[str] = Counter()
+        self.logins = 0
+        self.host = ""
+        self._sessions: set[str] = set()
+        self._token = secrets.token_hex(16)
+        self._random = random.Random(seed)
+
+    def set_hosts(self, count: int) -> None:
+        """Answer count synthetic hosts."""
+        self.payloads["hosts"] = generate_devices(count)
+
+    def expire_sessions(self) -> None:
+        """Refuse the sessions opened, as a Bbox restarting."""
+        self._sessions.clear()
+        self._token = secrets.token_hex(16)
+
+    def app(self) -> web.Application:
+        """Return the application to serve."""
+        app = web.Application()
+        app.router.add_post("/api/v1/login", self._login)
+        app.router.add_get("/api/v1/device/token", self._token_request)
+        app.router.add_route("*", "/api/v1/{path:.+}", self._request)
+        return app
+
+    async def _login(self, request: web.Request) -> web.Response:
+        """Open a session if the password is right."""
+        self.requests["login"] += 1
+        if (await request.post()).get("password") != PASSWORD:
+            return self._error(401)
+        self.logins += 1
+        session = secrets.token_hex(16)
+        self._sessions.add(session)
+        response = web.Response()
+        response.set_cookie(COOKIE, session)
+        return response
+
+    async def _token_request(self, request: web.Request) -> web.Response:
+        """Return the token of the requests of an open session."""
+        self.requests["device/token"] += 1
+        if request.cookies.get(COOKIE) not in self._sessions:
+            return self._error(401)
+        expires = datetime.now().astimezone() + timedelta(hours=1)
+        return web.json_response(
+            [{"device": {"token": self._token, "expires": expires.isoformat()}}]
+        )
+
+    async def _request(self, request: web.Request) -> web.Response:
+        """Answer a request of the API."""
+        path = request.match_info["path"]
+        self.requests[path] += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        if request.query.get("btoken") != self._token:
+            return self._error(401)
+        if path in self.failing or self._random.random() < self.error_rate:
+            return self._error(500)
+        if request.method != "GET":
+            return web.json_response({})
+        payload = self.payloads.get(path, [{}])
+        if self.padding:
+            payload = [{**payload[0], "padding": "x" * self.padding}, *payload[1:]]
+        return web.Response(text=json.dumps(payload), content_type="application/json")
+
+    @staticmethod
+    def _error(status: int) -> web.Response:
+        """Return an error as the Bbox does."""
+        return web.json_response(
+            {"exception": {"code": status, "errors": [{"reason": "Emulated error"}]}},
+            status=status,
+        )
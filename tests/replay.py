@@ -0,0 +1,52 @@
+"""Replay of recorded Bbox API traffic through the integration."""
+
+import json
+from pathlib import Path
+from time import perf_counter
+from typing import Any
+from unittest.mock import AsyncMock
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from custom_components.bbox.coordinator import ENDPOINTS
+from custom_components.bbox.recorder import read_recording
+
+
+async def async_replay(
+    hass: HomeAssistant, config_entry: ConfigEntry, router: AsyncMock, path: Path
+) -> dict[str, Any]:
+    """Feed each refresh of a recording to the coordinator and the entities.
+
+    Responses are decoded again for each request, as the Bbox client does.
+    Return the number of refreshes, the indexes of those which failed and
+    the refreshes per second.
+    """
+    refreshes = await hass.async_add_executor_job(
+        lambda: [
+            {section: json.dumps(payload) for section, payload in sections.items()}
+            for sections in read_recording(path)
+        ]
+    )
+    coordinator = config_entry.runtime_data
+    failures: list[int] = []
+    start = perf_counter()
+    for idx, sections in enumerate(refreshes):
+        for section, text in sections.items():
+            api, method = ENDPOINTS[section]
+
+            async def _response(text: str = text) -> Any:
+                return json.loads(text)
+
+            mock = getattr(getattr(router.return_value, api), method)
+            mock.side_effect = _response
+        await coordinator.async_refresh()
+        await hass.async_block_till_done()
+        if not coordinator.last_update_success:
+            failures.append(idx)
+    elapsed = perf_counter() - start
+    return {
+        "refreshes": len(refreshes),
+        "failures": failures,
+        "rate": len(refreshes) / elapsed if elapsed else None,
+    }
@@ -1,5 +1,8 @@
 """The tests for the bbox component."""
 
+import asyncio
+from contextlib import AsyncExitStack
+
 from homeassistant.components.button import DOMAIN as BUTTON_DOMAIN
 from homeassistant.components.button import SERVICE_PRESS
 from homeassistant.config_entries import ConfigEntry
@@ -20,9 +23,11 @@ async def test_reboot(
 
     await hass.config_entries.async_setup(config_entry.entry_id)
     await hass.async_block_till_done()
+    get_wan_ip = router.return_value.wan.async_get_wan_ip
+    wan_ip_calls = get_wan_ip.await_count
 
     data = {
-        ATTR_ENTITY_ID: "button.restart",
+        ATTR_ENTITY_ID: "button.bbox_restart",
     }
 
     await hass.services.async_call(
@@ -32,3 +37,24 @@ async def test_reboot(
         blocking=True,
     )
     await hass.async_block_till_done()
+
+    router.return_value.device.async_reboot.assert_awaited_once()
+    # Cached sections are fetched again by the refresh following a restart
+    assert get_wan_ip.await_count == wan_ip_calls + 1
+
+
+async def test_write_beside_reads(
+    hass: HomeAssistant, config_entry: ConfigEntry, router
+) -> None:
+    """Test a write is sent while the reads hold every request slot."""
+    await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+    coordinator = config_entry.runtime_data
+
+    async with AsyncExitStack() as stack:
+        while not coordinator._semaphore.locked():
+            await stack.enter_async_context(coordinator._semaphore)
+        async with asyncio.timeout(1):
+            await coordinator.async_write("device", "async_reboot")
+
+    router.return_value.device.async_reboot.assert_awaited_once()
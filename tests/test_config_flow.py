@@ -7,10 +7,15 @@ from bboxpy import BboxException
 from bboxpy.exceptions import AuthorizationError, HttpRequestError
 from homeassistant import config_entries, setup
 from homeassistant.core import HomeAssistant
-from homeassistant.data_entry_flow import FlowResultType
+from homeassistant.data_entry_flow import FlowResultType, InvalidData
 from pytest_homeassistant_custom_component.common import MockConfigEntry
 
-from custom_components.bbox.const import DOMAIN
+from custom_components.bbox.const import (
+    CONF_FAST_REFRESH_RATE,
+    CONF_REFRESH_RATE,
+    CONF_SLOW_REFRESH_RATE,
+    DOMAIN,
+)
 
 from .const import INFO, MOCK_USER_INPUT
 
@@ -150,3 +155,21 @@ async def test_form_already_configured(hass: HomeAssistant) -> None:
         # Assert the flow is aborted
         assert result2["type"] == FlowResultType.ABORT
         assert result2["reason"] == "already_configured"
+
+
+@pytest.mark.parametrize(
+    "option", [CONF_FAST_REFRESH_RATE, CONF_REFRESH_RATE, CONF_SLOW_REFRESH_RATE]
+)
+async def test_options_refresh_rate_invalid(hass: HomeAssistant, option: str) -> None:
+    """Test refresh rates below one second are rejected."""
+    config_entry = MockConfigEntry(domain=DOMAIN, data=MOCK_USER_INPUT)
+    config_entry.add_to_hass(hass)
+
+    result = await hass.config_entries.options.async_init(config_entry.entry_id)
+    assert result["type"] == FlowResultType.FORM
+
+    with pytest.raises(InvalidData):
+        await hass.config_entries.options.async_configure(
+            result["flow_id"], {option: 0}
+        )
+    assert config_entry.options == {}
@@ -0,0 +1,606 @@
+"""Tests for the Bbox data update coordinator."""
+
+import asyncio
+import copy
+import time
+from datetime import timedelta
+from typing import Any
+from unittest.mock import AsyncMock
+
+import pytest
+from bboxpy import BboxException, TimeoutExceededError
+from freezegun.api import FrozenDateTimeFactory
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.update_coordinator import UpdateFailed
+from pytest_homeassistant_custom_component.common import async_fire_time_changed
+
+from custom_components.bbox.const import (
+    CONF_ADAPTIVE_REFRESH,
+    CONF_FAST_REFRESH_RATE,
+    CONF_FULL_WRITE_INTERVAL,
+    CONF_MAX_REFRESH_RATE,
+    CONF_MAX_REQUESTS,
+    CONF_MAX_STALENESS,
+    CONF_MERGE_CONFLICT,
+    CONF_MIN_REFRESH_RATE,
+    CONF_REFRESH_RATE,
+    CONF_SLOW_REFRESH_RATE,
+    CONFLICT_COLLECT,
+    CONFLICT_LAST_WINS,
+    CONFLICT_RAISE,
+)
+from custom_components.bbox.coordinator import TIERS, BboxDataUpdateCoordinator
+from custom_components.bbox.hosts import Host
+
+from .const import MEM, WAN_IP_STATS, generate_devices
+
+DELAY = 0.1
+
+ENDPOINTS = (
+    ("device", "async_get_bbox_info"),
+    ("device", "async_get_bbox_mem"),
+    ("device", "async_get_bbox_led"),
+    ("lan", "async_get_connected_devices"),
+    ("wan", "async_get_wan_ip_stats"),
+    ("parentalcontrol", "async_get_parental_control_service_state"),
+    ("wifi", "async_get_wps"),
+    ("wifi", "async_get_wireless"),
+    ("wan", "async_get_wan_ip"),
+    ("speedtest", "async_get_speedtest_infos"),
+)
+
+
+def slow_down(router: AsyncMock, stats: dict[str, int]) -> None:
+    """Add latency to every endpoint and count simultaneous requests."""
+    for api, method in ENDPOINTS:
+        mock = getattr(getattr(router.return_value, api), method)
+        value = mock.return_value
+
+        async def _request(*args: Any, value: Any = value) -> Any:
+            stats["running"] += 1
+            stats["peak"] = max(stats["peak"], stats["running"])
+            await asyncio.sleep(DELAY)
+            stats["running"] -= 1
+            return value
+
+        mock.side_effect = _request
+
+
+async def test_concurrent_refresh(
+    hass: HomeAssistant, config_entry: ConfigEntry, router: AsyncMock
+) -> None:
+    """Test endpoints are fetched together."""
+    hass.config_entries.async_update_entry(
+        config_entry, options={CONF_MAX_REQUESTS: len(ENDPOINTS)}
+    )
+    await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    stats = {"running": 0, "peak": 0}
+    slow_down(router, stats)
+
+    start = time.monotonic()
+    await config_entry.runtime_data.async_refresh()
+    elapsed = time.monotonic() - start
+
+    assert config_entry.runtime_data.last_update_success
+    assert stats["peak"] == len(ENDPOINTS)
+    assert elapsed < DELAY * len(ENDPOINTS) / 2
+
+
+async def test_concurrent_refresh_limit(
+    hass: HomeAssistant, config_entry: ConfigEntry, router: AsyncMock
+) -> None:
+    """Test the number of simultaneous requests is capped."""
+    hass.config_entries.async_update_entry(config_entry, options={CONF_MAX_REQUESTS: 2})
+    await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    stats = {"running": 0, "peak": 0}
+    slow_down(router, stats)
+
+    start = time.monotonic()
+    await config_entry.runtime_data.async_refresh()
+    elapsed = time.monotonic() - start
+
+    assert config_entry.runtime_data.last_update_success
+    assert stats["peak"] == 2
+    assert elapsed >= DELAY * len(ENDPOINTS) / 2
+
+
+async def test_tiered_refresh(
+    hass: HomeAssistant,
+    config_entry: ConfigEntry,
+    router: AsyncMock,
+    freezer: FrozenDateTimeFactory,
+) -> None:
+    """Test each tier is refreshed at its own rate."""
+    hass.config_entries.async_update_entry(
+        config_entry,
+        options={
+            CONF_FAST_REFRESH_RATE: 10,
+            CONF_REFRESH_RATE: 30,
+            CONF_SLOW_REFRESH_RATE: 300,
+        },
+    )
+    await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    coordinator = config_entry.runtime_data
+    assert coordinator.update_interval == timedelta(seconds=10)
+
+    updates = {"wan_ip_stats": 0, "wifi": 0}
+    for section in updates:
+
+        def _update(section: str = section) -> None:
+            updates[section] += 1
+
+        coordinator.async_add_listener(_update, section)
+
+    instance = router.return_value
+    for _ in range(3):
+        freezer.tick(timedelta(seconds=11))
+        async_fire_time_changed(hass)
+        await hass.async_block_till_done(wait_background_tasks=True)
+
+    assert instance.wan.async_get_wan_ip_stats.await_count == 4
+    assert instance.wifi.async_get_wireless.await_count == 2
+    assert instance.device.async_get_bbox_info.await_count == 1
+    assert updates == {"wan_ip_stats": 3, "wifi": 1}
+
+
+def test_host_records() -> None:
+    """Test hosts keep only the fields used and devices drop the raw list."""
+    devices = BboxDataUpdateCoordinator.merge_objects(generate_devices(3))
+    hosts = BboxDataUpdateCoordinator.index_hosts(devices)
+    host = hosts["02:00:00:00:00:01"]
+    assert not hasattr(host, "__dict__")
+    assert host.as_dict() == {
+        "macaddress": "02:00:00:00:00:01",
+        "hostname": "Host-0001",
+        "userfriendlyname": "",
+        "ipaddress": "10.0.0.1",
+        "link": "Ethernet",
+        "lastseen": 0,
+        "active": 1,
+        "parentalcontrol": {"enable": 0},
+    }
+    assert Host.from_payload(host.as_dict()) == host
+    assert "list" not in BboxDataUpdateCoordinator.drop_host_list(devices)["hosts"]
+    assert devices["hosts"]["list"]
+
+
+async def test_change_aware_writes(
+    hass: HomeAssistant, config_entry: ConfigEntry, router: AsyncMock
+) -> None:
+    """Test only entities whose data changed are written."""
+    devices = generate_devices(3)
+    router.return_value.lan.async_get_connected_devices.return_value = devices
+    for api, method in ENDPOINTS:
+        mock = getattr(getattr(router.return_value, api), method)
+        mock.side_effect = lambda *args, value=mock.return_value: copy.deepcopy(value)
+
+    await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+    coordinator = config_entry.runtime_data
+
+    await coordinator.async_refresh()
+    listeners = coordinator.state_writes["skipped"]
+    assert listeners > 0
+    assert coordinator.state_writes["performed"] == 0
+
+    devices[0]["hosts"]["list"][1]["parentalcontrol"]["enable"] = 1
+    await coordinator.async_refresh()
+    # Tracker and parental control switch of the host
+    assert coordinator.state_writes == {"performed": 2, "skipped": listeners - 2}
+    assert hass.states.get("switch.host_0001_host_0001").state == "on"
+
+
+async def test_full_writes(
+    hass: HomeAssistant, config_entry: ConfigEntry, router: AsyncMock
+) -> None:
+    """Test all entities are written when full writes are forced."""
+    hass.config_entries.async_update_entry(
+        config_entry, options={CONF_FULL_WRITE_INTERVAL: 0}
+    )
+    for api, method in ENDPOINTS:
+        mock = getattr(getattr(router.return_value, api), method)
+        mock.side_effect = lambda *args, value=mock.return_value: copy.deepcopy(value)
+
+    await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+    coordinator = config_entry.runtime_data
+
+    await coordinator.async_refresh()
+    assert coordinator.state_writes["performed"] > 0
+    assert coordinator.state_writes["skipped"] == 0
+
+
+async def test_new_hosts_discovery(
+    hass: HomeAssistant, config_entry: ConfigEntry, router: AsyncMock
+) -> None:
+    """Test entities of new hosts are added without reloading."""
+    get_devices = router.return_value.lan.async_get_connected_devices
+    get_devices.return_value = generate_devices(2)
+    await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+    assert hass.states.get("switch.host_0002_host_0002") is None
+
+    get_devices.return_value = generate_devices(3)
+    await config_entry.runtime_data.async_refresh()
+    await hass.async_block_till_done()
+
+    assert hass.states.get("switch.host_0002_host_0002") is not None
+    assert hass.states.get("device_tracker.host_0002") is not None
+    assert len(hass.states.async_entity_ids("switch")) == 3 + 6
+
+
+async def test_endpoint_metrics(
+    hass: HomeAssistant, config_entry: ConfigEntry, router: AsyncMock
+) -> None:
+    """Test latency and errors are recorded for each endpoint."""
+    stats = {"running": 0, "peak": 0}
+    slow_down(router, stats)
+    router.return_value.wifi.async_get_wps.side_effect = BboxException("Error")
+
+    await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+    coordinator = config_entry.runtime_data
+
+    assert coordinator.refresh_duration >= DELAY * 1000
+    info = coordinator.endpoint_metrics["info"].as_dict()
+    assert info["requests"] == 1
+    assert info["errors"] == 0
+    assert DELAY * 1000 <= info["p50"] <= info["p95"] <= info["max"]
+    assert coordinator.endpoint_metrics["wps"].errors == 1
+
+
+async def test_adaptive_refresh(
+    hass: HomeAssistant, config_entry: ConfigEntry, router: AsyncMock
+) -> None:
+    """Test the interval follows data changes and the load of the Bbox."""
+    hass.config_entries.async_update_entry(
+        config_entry,
+        options={
+            CONF_ADAPTIVE_REFRESH: True,
+            CONF_FAST_REFRESH_RATE: 30,
+            CONF_REFRESH_RATE: 60,
+            CONF_MIN_REFRESH_RATE: 20,
+            CONF_MAX_REFRESH_RATE: 120,
+        },
+    )
+    await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+    coordinator = config_entry.runtime_data
+
+    def intervals() -> tuple[int, int, int]:
+        return tuple(coordinator.tier_intervals[tier] for tier in TIERS)
+
+    assert intervals() == (30, 60, 300)
+    assert coordinator.update_interval == timedelta(seconds=30)
+
+    instance = router.return_value
+    stats = copy.deepcopy(WAN_IP_STATS)
+    instance.wan.async_get_wan_ip_stats.side_effect = lambda: copy.deepcopy(stats)
+    rx = stats[0]["wan"]["ip"]["stats"]["rx"]
+    rx["bandwidth"] = int(rx["bandwidth"]) * 2 + 100
+    await coordinator.async_refresh()
+    await hass.async_block_till_done()
+    assert intervals() == (20, 30, 300)
+    # The sensor reports the adaptive interval, not the fast tier
+    assert hass.states.get("sensor.bbox_refresh_interval").state == "30"
+
+    rx["bandwidth"] = int(rx["bandwidth"]) * 2 + 100
+    await coordinator.async_refresh()
+    await hass.async_block_till_done()
+    assert intervals() == (20, 20, 300)
+    assert hass.states.get("sensor.bbox_refresh_interval").state == "20"
+
+    await coordinator.async_refresh()
+    assert intervals() == (20, 30, 300)
+
+    mem = copy.deepcopy(MEM)
+    mem[0]["device"]["mem"]["free"] = 1000
+    instance.device.async_get_bbox_mem.return_value = mem
+    await coordinator.async_refresh()
+    await coordinator.async_refresh()
+    assert intervals() == (60, 120, 300)
+    assert coordinator.update_interval == timedelta(seconds=60)
+
+
+async def test_circuit_breaker(
+    hass: HomeAssistant,
+    config_entry: ConfigEntry,
+    router: AsyncMock,
+    freezer: FrozenDateTimeFactory,
+) -> None:
+    """Test a failing endpoint is skipped, then probed again."""
+    speedtest = router.return_value.speedtest.async_get_speedtest_infos
+    speedtest.side_effect = BboxException("Not found")
+    await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+    coordinator = config_entry.runtime_data
+
+    for _ in range(4):
+        await coordinator.async_refresh()
+    assert speedtest.await_count == 3
+    assert coordinator.breakers["speedtest_infos"].as_dict() == {
+        "state": "open",
+        "failures": 3,
+        "retry_in": 60,
+    }
+    assert coordinator.last_update_success
+
+    freezer.tick(timedelta(seconds=61))
+    await coordinator.async_refresh()
+    assert speedtest.await_count == 4
+    assert coordinator.breakers["speedtest_infos"].as_dict()["retry_in"] == 120
+
+    speedtest.side_effect = None
+    freezer.tick(timedelta(seconds=121))
+    await coordinator.async_refresh()
+    assert speedtest.await_count == 5
+    assert coordinator.breakers["speedtest_infos"].state == "closed"
+    assert coordinator.data["speedtest_infos"]
+
+
+async def test_static_sections_cache(
+    hass: HomeAssistant,
+    config_entry: ConfigEntry,
+    router: AsyncMock,
+    freezer: FrozenDateTimeFactory,
+) -> None:
+    """Test rarely changing sections are cached until invalidated."""
+    hass.config_entries.async_update_entry(
+        config_entry, options={CONF_SLOW_REFRESH_RATE: 300}
+    )
+    await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+    coordinator = config_entry.runtime_data
+    instance = router.return_value
+
+    async def scheduled_refresh(seconds: int = 301) -> None:
+        freezer.tick(timedelta(seconds=seconds))
+        async_fire_time_changed(hass)
+        await hass.async_block_till_done(wait_background_tasks=True)
+
+    # Scheduled refreshes within the TTL of the cached sections don't request them
+    await scheduled_refresh()
+    await scheduled_refresh()
+    assert instance.device.async_get_bbox_info.await_count == 3
+    assert instance.device.async_get_bbox_mem.await_count == 3
+    assert instance.wan.async_get_wan_ip.await_count == 1
+    assert instance.speedtest.async_get_speedtest_infos.await_count == 1
+    assert coordinator.cache_stats == {"hits": 4, "misses": 2}
+
+    # The speed test has its own, shorter TTL
+    await scheduled_refresh(1800 - 2 * 301)
+    assert instance.speedtest.async_get_speedtest_infos.await_count == 2
+    assert instance.wan.async_get_wan_ip.await_count == 1
+
+    # A reset of the WAN counters fetches the slow tier on the next refresh
+    stats = copy.deepcopy(WAN_IP_STATS)
+    stats[0]["wan"]["ip"]["stats"]["rx"]["bytes"] = 0
+    instance.wan.async_get_wan_ip_stats.return_value = stats
+    await scheduled_refresh(11)
+    assert instance.device.async_get_bbox_info.await_count == 4
+    await scheduled_refresh(11)
+    assert instance.wan.async_get_wan_ip.await_count == 2
+    assert instance.device.async_get_bbox_info.await_count == 5
+
+    assert instance.speedtest.async_get_speedtest_infos.await_count == 2
+
+    coordinator.async_invalidate_cache()
+    await scheduled_refresh(11)
+    assert instance.wan.async_get_wan_ip.await_count == 3
+    assert instance.speedtest.async_get_speedtest_infos.await_count == 3
+
+    await coordinator.async_refresh()
+    assert instance.wan.async_get_wan_ip.await_count == 4
+
+
+def test_merge_objects() -> None:
+    """Test dicts are merged and lists concatenated."""
+    devices = BboxDataUpdateCoordinator.merge_objects(generate_devices(10, chunks=3))
+    assert len(devices["hosts"]["list"]) == 10
+
+
+def test_merge_objects_conflicts() -> None:
+    """Test the policies applied to different values of a key."""
+
+    def objs() -> list[dict[str, Any]]:
+        return [{"a": {"b": 1, "c": 1}}, {"a": {"b": 2, "d": 2}}]
+
+    with pytest.raises(ValueError, match="key a.b "):
+        BboxDataUpdateCoordinator.merge_objects(objs())
+
+    merged = BboxDataUpdateCoordinator.merge_objects(objs(), CONFLICT_LAST_WINS)
+    assert merged == {"a": {"b": 2, "c": 1, "d": 2}}
+
+    conflicts: list[str] = []
+    merged = BboxDataUpdateCoordinator.merge_objects(
+        objs(), CONFLICT_COLLECT, conflicts
+    )
+    assert merged == {"a": {"b": 1, "c": 1, "d": 2}}
+    assert len(conflicts) == 1
+    assert "key a.b " in conflicts[0]
+
+
+@pytest.mark.parametrize("objs", [{}, [], [{}, []]])
+def test_merge_objects_invalid(objs: Any) -> None:
+    """Test payloads which are not a list of dicts."""
+    with pytest.raises(UpdateFailed):
+        BboxDataUpdateCoordinator.merge_objects(objs)
+
+
+async def test_devices_conflicts(
+    hass: HomeAssistant, config_entry: ConfigEntry, router: AsyncMock
+) -> None:
+    """Test a conflict in the devices payload does not fail the refresh."""
+    devices = generate_devices(4, chunks=2)
+    devices[0]["hosts"]["count"], devices[1]["hosts"]["count"] = 2, 3
+    router.return_value.lan.async_get_connected_devices.return_value = devices
+
+    await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+    coordinator = config_entry.runtime_data
+
+    assert coordinator.last_update_success
+    assert len(coordinator.hosts) == 4
+    assert len(coordinator.merge_conflicts) == 1
+
+
+async def test_devices_conflict_policy(
+    hass: HomeAssistant, config_entry: ConfigEntry, router: AsyncMock
+) -> None:
+    """Test the conflict policy of the options is applied to the devices."""
+    await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+    coordinator = config_entry.runtime_data
+    devices = generate_devices(4, chunks=2)
+    devices[0]["hosts"]["count"], devices[1]["hosts"]["count"] = 2, 3
+    get_devices = router.return_value.lan.async_get_connected_devices
+    get_devices.side_effect = lambda: copy.deepcopy(devices)
+
+    hass.config_entries.async_update_entry(
+        config_entry, options={CONF_MERGE_CONFLICT: CONFLICT_LAST_WINS}
+    )
+    await hass.async_block_till_done()
+    await coordinator.async_refresh()
+    assert coordinator.data["devices"]["hosts"]["count"] == 3
+    assert len(coordinator.hosts) == 4
+    assert not coordinator.merge_conflicts
+
+    # The hosts of the last consistent response are kept
+    hosts = coordinator.hosts
+    devices = generate_devices(6, chunks=2)
+    devices[0]["hosts"]["count"], devices[1]["hosts"]["count"] = 3, 4
+    hass.config_entries.async_update_entry(
+        config_entry, options={CONF_MERGE_CONFLICT: CONFLICT_RAISE}
+    )
+    await hass.async_block_till_done()
+    await coordinator.async_refresh()
+    assert coordinator.last_update_success
+    assert coordinator.section_state("devices")["stale"]
+    assert coordinator.hosts == hosts
+
+
+async def test_stale_sections(
+    hass: HomeAssistant,
+    config_entry: ConfigEntry,
+    router: AsyncMock,
+    freezer: FrozenDateTimeFactory,
+) -> None:
+    """Test a failing section keeps its value until it is too old."""
+    hass.config_entries.async_update_entry(
+        config_entry, options={CONF_MAX_STALENESS: 60}
+    )
+    await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+    coordinator = config_entry.runtime_data
+    wifi = coordinator.data["wifi"]
+    state = hass.states.get("switch.bbox_wifi_guest").state
+
+    get_wireless = router.return_value.wifi.async_get_wireless
+    get_wireless.side_effect = BboxException("Error")
+    await coordinator.async_refresh()
+    await hass.async_block_till_done()
+    assert coordinator.data["wifi"] is wifi
+    assert coordinator.section_state("wifi") == {"age": 0, "stale": True}
+    assert hass.states.get("switch.bbox_wifi_guest").state == state
+
+    freezer.tick(timedelta(seconds=61))
+    await coordinator.async_refresh()
+    await hass.async_block_till_done()
+    assert hass.states.get("switch.bbox_wifi_guest").state == "unavailable"
+    assert hass.states.get("sensor.bbox_ip_address").state != "unavailable"
+
+    get_wireless.side_effect = None
+    await coordinator.async_refresh()
+    await hass.async_block_till_done()
+    assert hass.states.get("switch.bbox_wifi_guest").state == state
+    assert coordinator.section_state("wifi") == {"age": 0, "stale": False}
+
+
+async def test_unexpected_section_response(
+    hass: HomeAssistant, config_entry: ConfigEntry, router: AsyncMock
+) -> None:
+    """Test an unexpected response only marks its section as stale."""
+    await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+    coordinator = config_entry.runtime_data
+    wifi = coordinator.data["wifi"]
+
+    router.return_value.wifi.async_get_wireless.return_value = []
+    router.return_value.lan.async_get_connected_devices.return_value = {}
+    await coordinator.async_refresh()
+    assert coordinator.last_update_success
+    assert coordinator.data["wifi"] is wifi
+    assert coordinator.section_state("wifi")["stale"]
+    assert coordinator.section_state("devices")["stale"]
+    assert not coordinator.section_state("wps")["stale"]
+
+
+async def test_failed_refresh_cancels_sections(
+    hass: HomeAssistant, config_entry: ConfigEntry, router: AsyncMock
+) -> None:
+    """Test sections still running are cancelled when info fails."""
+    await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+    coordinator = config_entry.runtime_data
+    updated = coordinator.section_updated["wifi"]
+
+    async def _slow() -> list[dict[str, Any]]:
+        await asyncio.sleep(DELAY)
+        raise BboxException("Error")
+
+    router.return_value.wifi.async_get_wireless.side_effect = _slow
+    router.return_value.device.async_get_bbox_info.side_effect = BboxException("Error")
+    await coordinator.async_refresh()
+    assert not coordinator.last_update_success
+
+    await asyncio.sleep(DELAY * 2)
+    assert coordinator.section_updated["wifi"] == updated
+    assert not coordinator.section_state("wifi")["stale"]
+    assert coordinator.breakers["wifi"].failures == 0
+
+
+async def test_request_timeout(
+    hass: HomeAssistant, config_entry: ConfigEntry, router: AsyncMock
+) -> None:
+    """Test a request without response is abandoned, its section kept as stale."""
+    await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+    coordinator = config_entry.runtime_data
+    coordinator.request_timeout = DELAY
+
+    async def _hang() -> None:
+        await asyncio.sleep(10)
+
+    router.return_value.wifi.async_get_wireless.side_effect = _hang
+    await coordinator.async_refresh()
+    assert coordinator.last_update_success
+    assert coordinator.section_state("wifi")["stale"]
+    assert coordinator.endpoint_metrics["wifi"].errors == 1
+    assert coordinator.connections == {"created": 0, "reused": 0}
+
+
+async def test_login_timeout(
+    hass: HomeAssistant, config_entry: ConfigEntry, router: AsyncMock
+) -> None:
+    """Test a login without response is abandoned within the request timeout."""
+    await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+    coordinator = config_entry.runtime_data
+    coordinator.request_timeout = DELAY
+    coordinator._client.authenticated = False
+
+    async def _hang() -> None:
+        await asyncio.sleep(10)
+
+    router.return_value.async_auth.side_effect = _hang
+    async with asyncio.timeout(1):
+        await coordinator.async_refresh()
+    assert not coordinator.last_update_success
+    assert isinstance(coordinator.last_exception.__cause__, TimeoutExceededError)
@@ -0,0 +1,51 @@
+"""Tests for the Bbox diagnostics."""
+
+import asyncio
+from unittest.mock import AsyncMock, patch
+
+from bboxpy import BboxException, TimeoutExceededError
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from custom_components.bbox.diagnostics import async_get_config_entry_diagnostics
+
+
+async def test_diagnostics(
+    hass: HomeAssistant, config_entry: ConfigEntry, router: AsyncMock
+) -> None:
+    """Test endpoints are collected together under a deadline."""
+    instance = router.return_value
+
+    async def slow_request() -> list:
+        await asyncio.sleep(10)
+        return []
+
+    instance.ddns.async_get_ddns = AsyncMock(side_effect=slow_request)
+    instance.iptv.async_get_iptv_info = AsyncMock(side_effect=BboxException("Error"))
+    instance.voip.async_get_voip_voicemail = AsyncMock(
+        side_effect=TimeoutExceededError("Timeout")
+    )
+
+    await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    with patch("custom_components.bbox.diagnostics.DIAGNOSTICS_TIMEOUT", 0.2):
+        result = await async_get_config_entry_diagnostics(hass, config_entry)
+
+    requests = result["requests"]
+    assert requests["async_get_ddns"] == {"status": "timeout", "latency": 0.2}
+    assert requests["async_get_iptv_info"]["status"] == "error"
+    assert requests["async_get_voip_voicemail"]["status"] == "timeout"
+    assert "TimeoutExceededError" in requests["async_get_voip_voicemail"]["error"]
+    assert requests["async_get_bbox_info"]["status"] == "ok"
+    assert requests["async_get_bbox_info"]["size"] > 0
+    assert result["raw"]["async_get_ddns"] == {}
+    hosts = result["raw"]["async_get_connected_devices"][0]["hosts"]["list"]
+    assert hosts[0]["macaddress"] == "**REDACTED**"
+    assert result["breakers"]["speedtest_infos"] == {
+        "state": "closed",
+        "failures": 0,
+        "retry_in": 0,
+    }
+    assert result["metrics"]["connections"] == {"created": 0, "reused": 0}
+    assert result["metrics"]["logins_per_hour"] == 1
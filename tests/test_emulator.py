@@ -0,0 +1,49 @@
+"""End to end tests of the integration with an emulated Bbox."""
+
+from homeassistant.config_entries import ConfigEntry, ConfigEntryState
+from homeassistant.core import HomeAssistant
+
+from .emulator import BboxEmulator
+
+
+async def test_setup_over_http(
+    hass: HomeAssistant, emulated_entry: ConfigEntry, emulator: BboxEmulator
+) -> None:
+    """Test the integration is set up from the emulated API."""
+    emulator.set_hosts(50)
+    await hass.config_entries.async_setup(emulated_entry.entry_id)
+    await hass.async_block_till_done()
+
+    assert emulated_entry.state == ConfigEntryState.LOADED
+    coordinator = emulated_entry.runtime_data
+    assert len(coordinator.hosts) == 50
+    assert not coordinator.stale_sections
+    assert emulator.logins == 1
+    assert hass.states.get("sensor.bbox_memory_free").state != "unknown"
+
+    await coordinator.async_refresh()
+    assert emulator.logins == 1
+    assert emulator.requests["hosts"] == 2
+    assert coordinator.connections["created"] == 0
+    assert coordinator.connections["reused"] > 0
+
+
+async def test_errors_over_http(
+    hass: HomeAssistant, emulated_entry: ConfigEntry, emulator: BboxEmulator
+) -> None:
+    """Test failing endpoints and expired sessions of the emulated API."""
+    await hass.config_entries.async_setup(emulated_entry.entry_id)
+    await hass.async_block_till_done()
+    coordinator = emulated_entry.runtime_data
+
+    emulator.failing.add("wireless")
+    await coordinator.async_refresh()
+    assert coordinator.last_update_success
+    assert coordinator.stale_sections == {"wifi"}
+
+    emulator.failing.clear()
+    emulator.expire_sessions()
+    await coordinator.async_refresh()
+    assert coordinator.last_update_success
+    assert not coordinator.stale_sections
+    assert emulator.logins == 2
@@ -0,0 +1,59 @@
+"""Tests for the Bbox helpers."""
+
+from typing import Any
+
+import pytest
+
+from custom_components.bbox.helpers import compile_key_chain, finditem
+
+DATA = {
+    "wan_ip_stats": {"wan": {"ip": {"stats": {"rx": {"bandwidth": 1200}}}}},
+    "led": {"ethernetPort": [{"state": "up"}, {"state": "down"}]},
+    "info": {"device": {"status": 0, "name": ""}},
+}
+
+
+def legacy_finditem(data: Any, key_chain: str, default: Any = None) -> Any:
+    """Reference implementation parsing the key chain on each read."""
+    if (keys := key_chain.split(".")) and isinstance(keys, list):
+        for key in keys:
+            if isinstance(data, dict):
+                data = data.get(key)
+            elif (
+                isinstance(data, list)
+                and len(data) > 0
+                and key.isdigit()
+                and int(key) < len(data)
+            ):
+                data = data[int(key)]
+    return default if data is None and default is not None else data
+
+
+@pytest.mark.parametrize(
+    ("key_chain", "default"),
+    [
+        ("wan_ip_stats.wan.ip.stats.rx.bandwidth", None),
+        ("led.ethernetPort.0.state", None),
+        ("led.ethernetPort.1.state", "up"),
+        ("led.ethernetPort.5.state", None),
+        ("led.ethernetPort.state", None),
+        ("info.device.status", 1),
+        ("info.device.name", "default"),
+        ("info.device.missing", None),
+        ("info.device.missing", "default"),
+        ("missing.key", {}),
+        ("info", None),
+    ],
+)
+def test_compiled_key_chain(key_chain: str, default: Any) -> None:
+    """Test compiled getters behave as finditem always did."""
+    expected = legacy_finditem(DATA, key_chain, default)
+    assert compile_key_chain(key_chain)(DATA, default) == expected
+    assert finditem(DATA, key_chain, default) == expected
+
+
+def test_compiled_key_chain_is_cached() -> None:
+    """Test a key chain is parsed only once."""
+    assert compile_key_chain("led.ethernetPort.0.state") is compile_key_chain(
+        "led.ethernetPort.0.state"
+    )
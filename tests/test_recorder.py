@@ -0,0 +1,117 @@
+"""Tests for the recording and replay of the Bbox API traffic."""
+
+import copy
+import gzip
+from pathlib import Path
+from unittest.mock import AsyncMock
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from custom_components.bbox.const import CONF_RECORD_TRAFFIC
+from custom_components.bbox.recorder import TrafficRecorder, read_recording
+
+from .const import MEM, generate_devices
+from .emulator import BboxEmulator
+from .replay import async_replay
+
+
+def test_recording_redacted(tmp_path: Path) -> None:
+    """Test sensitive values are replaced by stable pseudonyms."""
+    path = tmp_path / "recording.jsonl.gz"
+    recorder = TrafficRecorder(path)
+    devices = generate_devices(3)
+    for _ in range(2):
+        recorder.add("devices", devices)
+        recorder.write(recorder.take())
+    recorder.write(recorder.take())
+
+    text = gzip.decompress(path.read_bytes()).decode()
+    hosts = devices[0]["hosts"]["list"]
+    assert all(host["macaddress"] not in text for host in hosts)
+    assert all(host["ipaddress"] not in text for host in hosts)
+
+    refreshes = list(read_recording(path))
+    assert len(refreshes) == 2
+    assert refreshes[0] == refreshes[1]
+    macs = [host["macaddress"] for host in refreshes[0]["devices"][0]["hosts"]["list"]]
+    assert len(set(macs)) == 3
+    assert macs[0].startswith("redacted-")
+    assert refreshes[0]["devices"][0]["hosts"]["list"][0]["id"] == 0
+
+
+def test_recording_appended_after_restart(tmp_path: Path) -> None:
+    """Test a recording appended by a new recorder keeps its pseudonyms."""
+    path = tmp_path / "recording.jsonl.gz"
+    devices = generate_devices(3)
+    for _ in range(2):
+        recorder = TrafficRecorder(path)
+        recorder.add("devices", devices)
+        recorder.write(recorder.take())
+
+    refreshes = list(read_recording(path))
+    assert len(refreshes) == 2
+    assert refreshes[0] == refreshes[1]
+
+
+def test_recording_rotated(tmp_path: Path) -> None:
+    """Test the recording is moved aside once over its maximum size."""
+    path = tmp_path / "recording.jsonl.gz"
+    recorder = TrafficRecorder(path, max_size=1)
+    for free in (1000, 2000, 3000):
+        mem = copy.deepcopy(MEM)
+        mem[0]["device"]["mem"]["free"] = free
+        recorder.add("memory", mem)
+        recorder.write(recorder.take())
+
+    rotated = tmp_path / "recording.jsonl.gz.1"
+    assert [len(list(read_recording(file))) for file in (rotated, path)] == [1, 1]
+    refresh = next(read_recording(path))
+    assert refresh["memory"][0]["device"]["mem"]["free"] == 3000
+
+
+async def test_record_traffic(
+    hass: HomeAssistant,
+    emulated_entry: ConfigEntry,
+    emulator: BboxEmulator,
+    tmp_path: Path,
+) -> None:
+    """Test the responses received are recorded when the option is set."""
+    hass.config.config_dir = str(tmp_path)
+    hass.config_entries.async_update_entry(
+        emulated_entry, options={CONF_RECORD_TRAFFIC: True}
+    )
+    emulator.set_hosts(20)
+    await hass.config_entries.async_setup(emulated_entry.entry_id)
+    await hass.async_block_till_done()
+    await emulated_entry.runtime_data.async_refresh()
+    await hass.async_block_till_done(wait_background_tasks=True)
+
+    path = tmp_path / f"bbox_{emulated_entry.entry_id}.jsonl.gz"
+    refreshes = await hass.async_add_executor_job(list, read_recording(path))
+    assert len(refreshes) == 2
+    assert "wifi" in refreshes[0]
+    assert len(refreshes[1]["devices"][0]["hosts"]["list"]) == 20
+
+
+async def test_replay(
+    hass: HomeAssistant, config_entry: ConfigEntry, router: AsyncMock, tmp_path: Path
+) -> None:
+    """Test a recording is replayed through the coordinator and entities."""
+    path = tmp_path / "recording.jsonl.gz"
+    recorder = TrafficRecorder(path)
+    for free in (1000, 2000, 3000):
+        mem = copy.deepcopy(MEM)
+        mem[0]["device"]["mem"]["free"] = free
+        recorder.add("memory", mem)
+        recorder.add("devices", generate_devices(10))
+        recorder.write(recorder.take())
+
+    await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+    result = await async_replay(hass, config_entry, router, path)
+
+    assert result["refreshes"] == 3
+    assert not result["failures"]
+    assert len(config_entry.runtime_data.hosts) == 10
+    assert config_entry.runtime_data.data["memory"]["device"]["mem"]["free"] == 3000
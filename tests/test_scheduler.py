@@ -0,0 +1,99 @@
+"""Tests for the poll scheduler of the Bbox entries."""
+
+import asyncio
+from unittest.mock import AsyncMock
+
+from homeassistant.config_entries import SOURCE_USER, ConfigEntry
+from homeassistant.core import HomeAssistant
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.bbox.const import DOMAIN
+from custom_components.bbox.scheduler import PollScheduler
+
+from .const import MOCK_USER_INPUT
+
+
+def test_phases() -> None:
+    """Test entries refresh at their phase, an interval apart."""
+    scheduler = PollScheduler(epoch=100, jitter=0)
+    unregister = [scheduler.register(entry_id) for entry_id in "abcd"]
+    assert [scheduler.phase(entry_id) for entry_id in "abcd"] == [0, 0.25, 0.5, 0.75]
+
+    assert scheduler.next_refresh("a", 100.2, 10) == 110
+    assert scheduler.next_refresh("b", 103, 10) == 112.5
+    assert scheduler.next_refresh("b", 112.6, 10) == 122.5
+    # A refresh scheduled late catches up with its phase
+    assert scheduler.next_refresh("d", 109, 10) == 117.5
+
+    unregister[1]()
+    assert scheduler.phase("c") == 1 / 3
+
+
+async def test_concurrency_limit() -> None:
+    """Test scheduled refreshes wait for a free slot."""
+    scheduler = PollScheduler(epoch=0, limit=2)
+    stats = {"running": 0, "peak": 0}
+
+    async def refresh() -> None:
+        async with scheduler.slot():
+            stats["running"] += 1
+            stats["peak"] = max(stats["peak"], stats["running"])
+            await asyncio.sleep(0.01)
+            stats["running"] -= 1
+
+    await asyncio.gather(*(refresh() for _ in range(5)))
+    assert stats["peak"] == 2
+    assert scheduler.waits == 3
+
+
+async def test_entries_spread(
+    hass: HomeAssistant, config_entry: ConfigEntry, router: AsyncMock
+) -> None:
+    """Test each entry gets its own phase, removed when unloaded."""
+    other_entry = MockConfigEntry(
+        domain=DOMAIN,
+        source=SOURCE_USER,
+        data={**MOCK_USER_INPUT, "host": "192.168.2.1"},
+        unique_id="2",
+        entry_id="654321",
+    )
+    other_entry.add_to_hass(hass)
+    await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    scheduler = config_entry.runtime_data.scheduler
+    assert other_entry.runtime_data.scheduler is scheduler
+    assert scheduler.as_dict(config_entry.entry_id) == {
+        "entries": 2,
+        "phase": 0,
+        "waits": 0,
+    }
+    assert scheduler.phase(other_entry.entry_id) == 0.5
+
+    await hass.config_entries.async_unload(config_entry.entry_id)
+    assert scheduler.phase(other_entry.entry_id) == 0
+
+
+async def test_retry_ignores_phase(
+    hass: HomeAssistant, config_entry: ConfigEntry, router: AsyncMock
+) -> None:
+    """Test a retry is scheduled from now, not at the phase of the entry."""
+    other_entry = MockConfigEntry(
+        domain=DOMAIN,
+        source=SOURCE_USER,
+        data={**MOCK_USER_INPUT, "host": "192.168.2.1"},
+        unique_id="2",
+        entry_id="654321",
+    )
+    other_entry.add_to_hass(hass)
+    await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    coordinator = other_entry.runtime_data
+    coordinator._schedule_refresh()
+    assert coordinator._microsecond != coordinator._retry_microsecond
+
+    coordinator._retry_after = 5
+    coordinator._schedule_refresh()
+    assert coordinator._microsecond == coordinator._retry_microsecond < 1
+    assert coordinator._retry_after is None
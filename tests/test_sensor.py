@@ -1,12 +1,17 @@
 """Tests for the Bbox sensor platform."""
 
+import copy
 from typing import Generator
-from unittest.mock import AsyncMock, MagicMock
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
 
+from custom_components.bbox.sensor import BboxMetricsSensor
+
+from .const import WAN_IP_STATS
+
 
 @pytest.mark.asyncio
 async def test_sensors_state(
@@ -40,3 +45,50 @@ async def test_sensors_state(
     # From memory.json, free is 114310 and total is 214000.
     # The get_value function calculates (free * 100) / total
     assert float(state.state) == 53.4245373658048
+
+
+async def test_metrics_sensors(
+    hass: HomeAssistant, config_entry: ConfigEntry, router: AsyncMock
+) -> None:
+    """Test the diagnostic sensors of the requests."""
+    with patch.object(
+        BboxMetricsSensor, "_attr_entity_registry_enabled_default", True, create=True
+    ):
+        await hass.config_entries.async_setup(config_entry.entry_id)
+        await hass.async_block_till_done()
+    await config_entry.runtime_data.async_refresh()
+    await hass.async_block_till_done()
+
+    state = hass.states.get("sensor.bbox_latency_devices")
+    assert state is not None
+    assert state.attributes["requests"] == 2
+    assert float(state.state) == state.attributes["p95"]
+    assert hass.states.get("sensor.bbox_refresh_duration").state != "unknown"
+    assert hass.states.get("sensor.bbox_request_errors").state == "0"
+
+
+async def test_derived_sensors(
+    hass: HomeAssistant, config_entry: ConfigEntry, router: AsyncMock
+) -> None:
+    """Test derived values are computed with their section."""
+    await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+    coordinator = config_entry.runtime_data
+
+    derived = coordinator.data["derived"]
+    assert derived["rx_occupation"] == 10.0
+    assert derived["tx_occupation"] == 10.0
+    assert derived["rx_kilobits"] == 602044.62
+    assert derived["tx_kilobits"] == 18753561.01
+    assert derived["memory_free"] == pytest.approx(53.4245, abs=1e-4)
+    assert hass.states.get("sensor.bbox_download_bandwidth_occupation").state == "10.0"
+
+    stats = copy.deepcopy(WAN_IP_STATS)
+    stats[0]["wan"]["ip"]["stats"]["rx"]["maxBandwidth"] = 0
+    router.return_value.wan.async_get_wan_ip_stats.return_value = stats
+    await coordinator.async_refresh()
+    await hass.async_block_till_done()
+    assert coordinator.data["derived"]["rx_occupation"] is None
+    assert hass.states.get("sensor.bbox_download_bandwidth_occupation").state == (
+        "unknown"
+    )
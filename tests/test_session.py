@@ -0,0 +1,61 @@
+"""Tests for the HTTP sessions of the Bbox clients."""
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+from homeassistant.const import EVENT_HOMEASSISTANT_CLOSE
+from homeassistant.core import HomeAssistant
+
+from custom_components.bbox.session import (
+    async_create_session,
+    async_get_connection_stats,
+    async_get_session,
+    async_remove_client_slot,
+)
+
+
+async def test_entry_session(hass: HomeAssistant) -> None:
+    """Test each entry has a session with its own cookies over HA connections."""
+    session = async_get_session(hass, "entry", True)
+    assert async_get_session(hass, "entry", True) is session
+    other = async_get_session(hass, "other", True)
+    assert other is not session
+    assert other.cookie_jar is not session.cookie_jar
+    assert other.connector is session.connector
+    flow = async_create_session(hass, True)
+    assert flow.cookie_jar is not session.cookie_jar
+
+    verify = async_get_session(hass, "entry", False)
+    assert verify is not session
+    assert session.connector is None
+
+    async_remove_client_slot(hass, "entry")
+    assert verify.connector is None
+    assert async_get_session(hass, "entry", False) is not verify
+
+    hass.bus.async_fire(EVENT_HOMEASSISTANT_CLOSE)
+    await hass.async_block_till_done()
+    assert other.connector is None
+
+
+async def test_connection_stats(hass: HomeAssistant, socket_enabled: None) -> None:
+    """Test new and reused connections are counted per host."""
+
+    async def handler(_request: web.Request) -> web.Response:
+        return web.json_response({})
+
+    app = web.Application()
+    app.router.add_get("/", handler)
+    async with TestServer(app, host="127.0.0.1") as server:
+        session = async_create_session(hass, False)
+        for _ in range(3):
+            async with session.get(server.make_url("/")) as response:
+                await response.read()
+
+    assert async_get_connection_stats(hass, "127.0.0.1") == {
+        "created": 1,
+        "reused": 2,
+    }
+    assert async_get_connection_stats(hass, "mabbox.bytel.fr") == {
+        "created": 0,
+        "reused": 0,
+    }
@@ -1,11 +1,32 @@
 """Tests pour l'intégration Bbox2 utilisant config_entries."""
 
-from typing import Generator
+import asyncio
+import copy
+from datetime import timedelta
+from typing import Any, Generator
 from unittest.mock import AsyncMock, MagicMock
 
 import pytest
-from homeassistant.config_entries import ConfigEntry, ConfigEntryState
+from bboxpy import AuthorizationError
+from freezegun.api import FrozenDateTimeFactory
+from homeassistant.config_entries import SOURCE_REAUTH, ConfigEntry, ConfigEntryState
 from homeassistant.core import HomeAssistant
+from pytest_homeassistant_custom_component.common import async_fire_time_changed
+
+from custom_components.bbox.coordinator import SNAPSHOT_SAVE_DELAY, SNAPSHOT_VERSION
+
+from .const import (
+    DEVICES,
+    INFO,
+    LEDS,
+    MEM,
+    PARENTALCONTROL,
+    SPEEDTEST_INFOS,
+    WAN_IP,
+    WAN_IP_STATS,
+    WIFI,
+    WPS,
+)
 
 
 @pytest.mark.asyncio
@@ -20,3 +41,195 @@ async def test_setup_entry(
     await hass.async_block_till_done()
 
     assert config_entry.state == ConfigEntryState.LOADED
+
+
+def snapshot() -> dict[str, Any]:
+    """Return a snapshot of the data of the fixtures."""
+    return {
+        "version": SNAPSHOT_VERSION,
+        "minor_version": 1,
+        "key": "bbox.123456",
+        "data": {
+            section: copy.deepcopy(payload[0])
+            for section, payload in (
+                ("info", INFO),
+                ("memory", MEM),
+                ("led", LEDS),
+                ("devices", DEVICES),
+                ("wan_ip_stats", WAN_IP_STATS),
+                ("parentalcontrol", PARENTALCONTROL),
+                ("wps", WPS),
+                ("wifi", WIFI),
+                ("wan_ip", WAN_IP),
+                ("speedtest_infos", SPEEDTEST_INFOS),
+            )
+        },
+    }
+
+
+async def test_setup_from_snapshot(
+    hass: HomeAssistant,
+    hass_storage: dict[str, Any],
+    config_entry: ConfigEntry,
+    router: AsyncMock,
+) -> None:
+    """Test entities are created from the snapshot without waiting for the Bbox."""
+    hass_storage["bbox.123456"] = snapshot()
+    hass_storage["bbox.123456"]["data"]["wan_ip"]["wan"]["ip"]["address"] = "10.0.0.1"
+    release = asyncio.Event()
+
+    async def slow_request() -> list[dict[str, Any]]:
+        await release.wait()
+        return WAN_IP
+
+    router.return_value.wan.async_get_wan_ip.side_effect = slow_request
+
+    await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done(wait_background_tasks=False)
+
+    assert config_entry.state == ConfigEntryState.LOADED
+    assert hass.states.get("sensor.bbox_ip_address").state == "10.0.0.1"
+    assert hass.states.get("device_tracker.host_001") is not None
+
+    release.set()
+    await hass.async_block_till_done(wait_background_tasks=True)
+    assert hass.states.get("sensor.bbox_ip_address").state == "176.0.0.0"
+
+
+async def test_snapshot_saved(
+    hass: HomeAssistant,
+    hass_storage: dict[str, Any],
+    config_entry: ConfigEntry,
+    router: AsyncMock,
+    freezer: FrozenDateTimeFactory,
+) -> None:
+    """Test the data is saved after a refresh, then removed with the entry."""
+    await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+    assert "bbox.123456" not in hass_storage
+
+    freezer.tick(timedelta(seconds=SNAPSHOT_SAVE_DELAY + 1))
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+    saved = hass_storage["bbox.123456"]["data"]
+    hosts = saved["devices"]["hosts"].pop("list")
+    assert saved == config_entry.runtime_data.data
+    assert [host["macaddress"] for host in hosts] == list(
+        config_entry.runtime_data.hosts
+    )
+
+    await hass.config_entries.async_remove(config_entry.entry_id)
+    await hass.async_block_till_done()
+    assert "bbox.123456" not in hass_storage
+
+
+async def test_snapshot_removed_before_saved(
+    hass: HomeAssistant,
+    hass_storage: dict[str, Any],
+    config_entry: ConfigEntry,
+    router: AsyncMock,
+    freezer: FrozenDateTimeFactory,
+) -> None:
+    """Test removing the entry cancels the save of the snapshot pending."""
+    await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+    await config_entry.runtime_data.async_refresh()
+
+    await hass.config_entries.async_remove(config_entry.entry_id)
+    await hass.async_block_till_done()
+    freezer.tick(timedelta(seconds=2 * SNAPSHOT_SAVE_DELAY))
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+    assert "bbox.123456" not in hass_storage
+
+
+async def test_snapshot_saved_while_polling(
+    hass: HomeAssistant,
+    hass_storage: dict[str, Any],
+    config_entry: ConfigEntry,
+    router: AsyncMock,
+    freezer: FrozenDateTimeFactory,
+) -> None:
+    """Test refreshes more frequent than the save delay do not delay the save."""
+    await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    for _ in range(SNAPSHOT_SAVE_DELAY // 10 + 1):
+        await config_entry.runtime_data.async_refresh()
+        freezer.tick(timedelta(seconds=10))
+        async_fire_time_changed(hass)
+        await hass.async_block_till_done()
+    assert "bbox.123456" in hass_storage
+
+    del hass_storage["bbox.123456"]
+    for _ in range(SNAPSHOT_SAVE_DELAY // 10 + 1):
+        await config_entry.runtime_data.async_refresh()
+        freezer.tick(timedelta(seconds=10))
+        async_fire_time_changed(hass)
+        await hass.async_block_till_done()
+    assert "bbox.123456" in hass_storage
+
+
+async def test_login_kept_across_reloads(
+    hass: HomeAssistant, config_entry: ConfigEntry, router: AsyncMock
+) -> None:
+    """Test a reload reuses the client logged in."""
+    await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+    assert await hass.config_entries.async_reload(config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    assert config_entry.state == ConfigEntryState.LOADED
+    assert router.call_count == 1
+    assert router.return_value.async_auth.await_count == 1
+    assert config_entry.runtime_data.logins_per_hour() == 1
+
+
+async def test_login_again(
+    hass: HomeAssistant, config_entry: ConfigEntry, router: AsyncMock
+) -> None:
+    """Test a refused session logs in again once with a new client."""
+    await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+    coordinator = config_entry.runtime_data
+    instance = router.return_value
+    instance.wifi.async_get_wireless.side_effect = [AuthorizationError, WIFI]
+
+    await coordinator.async_refresh()
+    assert coordinator.last_update_success
+    assert not coordinator.stale_sections
+    assert router.call_count == 2
+    assert instance.async_auth.await_count == 2
+    assert coordinator.logins_per_hour() == 2
+
+
+async def test_write_login_again(
+    hass: HomeAssistant, config_entry: ConfigEntry, router: AsyncMock
+) -> None:
+    """Test a write refused for an expired session is sent again after a login."""
+    await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+    coordinator = config_entry.runtime_data
+    instance = router.return_value
+    instance.device.async_reboot.side_effect = [AuthorizationError, None]
+
+    await coordinator.async_write("device", "async_reboot")
+    assert instance.device.async_reboot.await_count == 2
+    assert router.call_count == 2
+    assert instance.async_auth.await_count == 2
+
+
+async def test_login_refused(
+    hass: HomeAssistant, config_entry: ConfigEntry, router: AsyncMock
+) -> None:
+    """Test a reauthentication starts when logging in again fails."""
+    await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+    instance = router.return_value
+    instance.wifi.async_get_wireless.side_effect = AuthorizationError
+    instance.async_auth.side_effect = AuthorizationError
+
+    await config_entry.runtime_data.async_refresh()
+    await hass.async_block_till_done()
+    assert not config_entry.runtime_data.last_update_success
+    assert config_entry.async_get_active_flows(hass, {SOURCE_REAUTH})
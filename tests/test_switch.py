@@ -6,7 +6,7 @@ from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import STATE_OFF, STATE_ON, Platform
 from homeassistant.core import HomeAssistant
 
-from .const import WIFI
+from .const import DEVICES, WIFI
 
 
 @pytest.mark.asyncio
@@ -58,3 +58,89 @@ async def test_switch_wifi(
     router.return_value.wifi.async_set_wireless_guest.assert_awaited_once_with(
         enable=True
     )
+
+
+@pytest.mark.asyncio
+async def test_switch_device_parental_control(
+    hass: HomeAssistant, config_entry: ConfigEntry, router: AsyncMock
+):
+    """Test a toggle is confirmed by reading only the switch endpoint."""
+    devices = copy.deepcopy(DEVICES)
+    host = devices[0]["hosts"]["list"][0]
+    host["parentalcontrol"]["enable"] = 0
+    router.return_value.lan.async_get_connected_devices.return_value = devices
+
+    async def mock_set_device_parental_control_state(macaddress, enable):
+        host["parentalcontrol"]["enable"] = 1 if enable else 0
+
+    parentalcontrol = router.return_value.parentalcontrol
+    parentalcontrol.async_set_device_parental_control_state.side_effect = (
+        mock_set_device_parental_control_state
+    )
+
+    await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    state = hass.states.get("switch.host_001_host_001")
+    assert state.state == STATE_OFF
+
+    get_info = router.return_value.device.async_get_bbox_info
+    get_devices = router.return_value.lan.async_get_connected_devices
+    info_calls = get_info.await_count
+    devices_calls = get_devices.await_count
+
+    await hass.services.async_call(
+        Platform.SWITCH,
+        "turn_on",
+        {"entity_id": "switch.host_001_host_001"},
+        blocking=True,
+    )
+
+    state = hass.states.get("switch.host_001_host_001")
+    assert state.state == STATE_ON
+    assert get_devices.await_count == devices_calls + 1
+    assert get_info.await_count == info_calls
+
+
+@pytest.mark.asyncio
+async def test_switch_burst(
+    hass: HomeAssistant, config_entry: ConfigEntry, router: AsyncMock
+):
+    """Test a burst of toggles is confirmed by a single read."""
+    devices = copy.deepcopy(DEVICES)
+    hosts = {host["macaddress"]: host for host in devices[0]["hosts"]["list"]}
+    for host in hosts.values():
+        host["parentalcontrol"]["enable"] = 0
+    router.return_value.lan.async_get_connected_devices.return_value = devices
+
+    async def mock_set_device_parental_control_state(macaddress, enable):
+        hosts[macaddress]["parentalcontrol"]["enable"] = 1 if enable else 0
+
+    parentalcontrol = router.return_value.parentalcontrol
+    parentalcontrol.async_set_device_parental_control_state.side_effect = (
+        mock_set_device_parental_control_state
+    )
+
+    await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    entity_ids = [
+        "switch.host_001_host_001",
+        "switch.host_004_host_004",
+        "switch.host_006_host_006",
+    ]
+    get_devices = router.return_value.lan.async_get_connected_devices
+    devices_calls = get_devices.await_count
+    coordinator = config_entry.runtime_data
+    unsub_refresh = coordinator._unsub_refresh
+
+    await hass.services.async_call(
+        Platform.SWITCH, "turn_on", {"entity_id": entity_ids}, blocking=True
+    )
+
+    for entity_id in entity_ids:
+        assert hass.states.get(entity_id).state == STATE_ON
+    assert parentalcontrol.async_set_device_parental_control_state.await_count == 3
+    assert get_devices.await_count == devices_calls + 1
+    # The confirmation does not reschedule the polling
+    assert coordinator._unsub_refresh is unsub_refresh
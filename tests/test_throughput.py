@@ -0,0 +1,158 @@
+"""Tests for the Bbox WAN throughput."""
+
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+from bboxpy import BboxException
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from custom_components.bbox.const import CONF_ADAPTIVE_REFRESH, CONF_MIN_REFRESH_RATE
+from custom_components.bbox.sensor import SENSOR_TYPES
+from custom_components.bbox.throughput import ThroughputBuffer, samples_for
+
+
+def test_throughput_averages() -> None:
+    """Test the current throughput, rolling averages and peak."""
+    buffer = ThroughputBuffer()
+    for idx in range(91):
+        # 1250 bytes/s (10 kbit/s), then 12500 bytes/s the last minute
+        rx = 1250 * 10 * min(idx, 84) + 12500 * 10 * max(idx - 84, 0)
+        buffer.add(idx * 10, rx, 0, boots=1)
+
+    assert buffer.current("rx") == 100
+    assert buffer.average("rx", 60) == 100
+    assert buffer.average("rx", 300) == 28
+    assert buffer.average("rx", 900) == 16
+    assert buffer.percentile("rx", 95, 900) == 100
+    assert buffer.current("tx") == 0
+
+
+def test_throughput_counter_reset() -> None:
+    """Test counters restarted by a reboot or wrapping around."""
+    buffer = ThroughputBuffer()
+    buffer.add(0, 10_000, 2**32 - 1250, boots=1)
+    buffer.add(10, 22_500, 11_250, boots=1)
+    assert buffer.current("rx") == 10
+    assert buffer.current("tx") == 10
+
+    buffer.add(20, 12_500, 12_500, boots=2)
+    assert buffer.current("rx") == 10
+    assert buffer.current("tx") == 10
+
+    # Reset without a reboot, when the WAN reconnects
+    buffer.add(30, 25_000, 25_000, boots=2)
+    buffer.add(40, 12_500, 12_500, boots=2)
+    assert buffer.current("rx") == 10
+    assert buffer.current("tx") == 10
+
+
+def test_throughput_reboot_counted_once() -> None:
+    """Test a reboot seen by the counters before boots changed is counted once."""
+    buffer = ThroughputBuffer()
+    buffer.add(0, 1_000_000, 1_000_000, boots=1)
+    buffer.add(10, 1_010_000, 1_010_000, boots=1)
+    # Counters restarted, info still cached with the previous boots
+    buffer.add(20, 10_000, 10_000, boots=1)
+    assert buffer.current("rx") == 8
+    buffer.add(30, 20_000, 20_000, boots=2)
+    assert buffer.current("rx") == 8
+    assert buffer.current("tx") == 8
+    assert buffer.average("rx", 60) == 8
+
+    # The next reboot seen by boots only is counted
+    buffer.add(40, 30_000, 30_000, boots=3)
+    assert buffer.current("rx") == 24
+
+
+def test_throughput_buffer_is_bounded() -> None:
+    """Test old samples are overwritten."""
+    buffer = ThroughputBuffer(capacity=8)
+    for idx in range(100):
+        buffer.add(idx, idx * 125, 0)
+
+    assert len(buffer) == 8
+    assert buffer.average("rx", 3600) == 1
+    assert buffer.percentile("rx", 95, 3600) == 1
+
+
+def test_throughput_at_fastest_rate() -> None:
+    """Test the 15 minutes average with a sample every second."""
+    buffer = ThroughputBuffer(samples_for(1))
+    rx = 0
+    for idx in range(1201):
+        buffer.add(idx, rx, 0)
+        # 1250 bytes/s (10 kbit/s), then 12500 bytes/s after 10 minutes
+        rx += 1250 if idx < 600 else 12500
+
+    assert buffer.average("rx", 60) == 100
+    assert buffer.average("rx", 900) == 70
+
+
+def test_throughput_resize() -> None:
+    """Test the most recent samples are kept when the capacity changes."""
+    buffer = ThroughputBuffer(capacity=8)
+    for idx in range(10):
+        buffer.add(idx * 10, idx * 12500, 0)
+
+    buffer.resize(4)
+    assert len(buffer) == 4
+    assert buffer.average("rx", 3600) == 10
+    buffer.resize(16)
+    buffer.add(100, 9 * 12500 + 125_000, 0)
+    assert len(buffer) == 5
+    assert buffer.current("rx") == 100
+    assert buffer.average("rx", 3600) == 32.5
+
+
+async def test_throughput_sized_from_options(
+    hass: HomeAssistant, config_entry: ConfigEntry, router: AsyncMock
+) -> None:
+    """Test the buffer holds the longest window at the fastest refresh rate."""
+    await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+    coordinator = config_entry.runtime_data
+    # Refreshed every 10 seconds, maybe a second early
+    assert coordinator.throughput.capacity == samples_for(9)
+
+    hass.config_entries.async_update_entry(
+        config_entry,
+        options={CONF_ADAPTIVE_REFRESH: True, CONF_MIN_REFRESH_RATE: 1},
+    )
+    await hass.async_block_till_done()
+    assert coordinator.throughput.capacity == 901
+
+
+async def test_throughput_sensors(
+    hass: HomeAssistant, config_entry: ConfigEntry, router: AsyncMock
+) -> None:
+    """Test the throughput sensors follow the WAN counters."""
+    await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+    assert hass.states.get("sensor.bbox_download_throughput").state == "unknown"
+
+    await config_entry.runtime_data.async_refresh()
+    await hass.async_block_till_done()
+    state = hass.states.get("sensor.bbox_download_throughput")
+    assert float(state.state) == 0
+    assert state.attributes["avg_1m"] == 0
+    assert state.attributes["p95_15m"] == 0
+
+
+async def test_throughput_sensors_without_derived(
+    hass: HomeAssistant, config_entry: ConfigEntry, router: AsyncMock
+) -> None:
+    """Test the throughput sensors when no derived value could be computed."""
+    router.return_value.wan.async_get_wan_ip_stats.side_effect = BboxException
+    router.return_value.device.async_get_bbox_mem.side_effect = BboxException
+    await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    coordinator = config_entry.runtime_data
+    assert "derived" not in coordinator.data
+    description = next(
+        description
+        for description in SENSOR_TYPES
+        if description.derived == "rx_throughput"
+    )
+    assert description.attributes_fn(SimpleNamespace(coordinator=coordinator)) is None